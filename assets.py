@@ -0,0 +1,108 @@
+# assets.py
+"""
+Build step for static files. It vendors the CDN libraries into static/dist and
+writes every asset under a content-hash name, so it can be cached forever.
+styles.css is minified. .gz variants are always written, and .br variants
+when the brotli package is installed. The hashed names are listed in
+static/dist/manifest.json.
+
+    flask --app app build-assets
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import urllib.request
+
+try:
+    import brotli
+except ImportError:  # Optional: only .gz variants are written without it
+    brotli = None
+
+DIST_FOLDER = 'dist'
+MANIFEST_FILE = 'manifest.json'
+
+# Logical name -> upstream URL. Until the build has run, asset_url() links these directly.
+VENDOR_ASSETS = {
+    'vendor/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/chart.umd.js': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+    'vendor/chartjs-adapter-date-fns.bundle.min.js':
+        'https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns@3.0.0/dist/chartjs-adapter-date-fns.bundle.min.js',
+}
+
+# Files already in static/ that get hashed copies
+LOCAL_ASSETS = ['styles.css', 'player_search.js', 'live_scoreboard.js', 'images/logo.png', 'images/fav.png']
+
+# Only text formats benefit from compression
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json')
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def hashed_name(name, content):
+    root, extension = os.path.splitext(name)
+    return f'{root}.{hashlib.sha256(content).hexdigest()[:12]}{extension}'
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+def write_asset(dist_path, name, content):
+    target = os.path.join(dist_path, hashed_name(name, content))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(content)
+    if name.endswith(COMPRESSIBLE_EXTENSIONS):
+        with open(f'{target}.gz', 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(f'{target}.br', 'wb') as f:
+                f.write(brotli.compress(content))
+    return os.path.relpath(target, dist_path).replace(os.sep, '/')
+
+
+def build(static_folder, offline=False, log=print):
+    """
+    Rebuilds static/dist and its manifest. With offline=True the vendor files are
+    not downloaded and keep being served from the CDN.
+    """
+    dist_path = os.path.join(static_folder, DIST_FOLDER)
+    shutil.rmtree(dist_path, ignore_errors=True)
+    os.makedirs(dist_path)
+
+    manifest = {}
+    for name in LOCAL_ASSETS:
+        with open(os.path.join(static_folder, name), 'rb') as f:
+            content = f.read()
+        if name.endswith('.css'):
+            content = minify_css(content.decode('utf-8')).encode('utf-8')
+        manifest[name] = write_asset(dist_path, name, content)
+        log(f'{name} -> {manifest[name]}')
+
+    if not offline:
+        for name, url in VENDOR_ASSETS.items():
+            manifest[name] = write_asset(dist_path, name, fetch(url))
+            log(f'{name} -> {manifest[name]}')
+
+    with open(os.path.join(dist_path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_FOLDER, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,173 @@
+"""
+Throughput of an authenticated read route, with and without the user cache.
+
+Serves a copy of a database made by generate_data.py with gunicorn and
+gunicorn.conf.py, logs --readers clients in, and counts the requests per
+second they complete on --path over keep-alive connections. It does this
+twice, with USER_CACHE_SECONDS=0 (a user query per request) and with the
+cache on. Each run has two phases: reads alone, and reads while --loggers
+clients keep logging in, so scrypt checks compete with the reads.
+
+    python benchmarks/generate_data.py bench.db --players 10000 --tournaments 2000 --points 1000000
+    python benchmarks/auth_load.py bench.db --readers 8 --loggers 2
+"""
+
+import argparse
+import http.client
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from werkzeug.security import generate_password_hash
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERNAME = 'bench'
+PASSWORD = 'bench-password'
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def add_user(database):
+    connection = sqlite3.connect(database)
+    try:
+        connection.execute('DELETE FROM user WHERE username = ?', (USERNAME,))
+        connection.execute('INSERT INTO user (username, password) VALUES (?, ?)',
+                           (USERNAME, generate_password_hash(PASSWORD, method='scrypt')))
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def log_in(connection):
+    """Posts the login form and returns the session cookie."""
+    body = urllib.parse.urlencode({'username': USERNAME, 'password': PASSWORD})
+    connection.request('POST', '/login', body, {'Content-Type': 'application/x-www-form-urlencoded'})
+    response = connection.getresponse()
+    response.read()
+    if response.status != 302:
+        raise RuntimeError(f'Login failed: HTTP {response.status}')
+    return response.getheader('Set-Cookie').split(';', 1)[0]
+
+
+def run_phase(port, path, readers, loggers, duration):
+    completed = [0] * readers
+    logins = []
+    errors = []
+    stop = threading.Event()
+    started = threading.Barrier(readers + loggers + 1)
+
+    def reader(index):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        cookie = log_in(connection)
+        started.wait()
+        while not stop.is_set():
+            connection.request('GET', path, headers={'Cookie': cookie})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(f'{path}: HTTP {response.status}')
+            completed[index] += 1
+        connection.close()
+
+    def logger():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        started.wait()
+        while not stop.is_set():
+            start = time.perf_counter()
+            log_in(connection)
+            logins.append(time.perf_counter() - start)
+        connection.close()
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=logger) for _ in range(loggers)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(completed) / duration, logins, errors
+
+
+def serve(database, port, args, user_cache_seconds):
+    environment = dict(
+        os.environ,
+        DATABASE_URL=f'sqlite:///{database}',
+        INSTANCE_PATH=os.path.join(os.path.dirname(database), 'instance'),
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        USER_CACHE_SECONDS=str(user_cache_seconds),
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+         '--chdir', os.path.dirname(database), '--pythonpath', ROOT,
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'app:create_app()'],
+        env=environment,
+    )
+    for _ in range(100):
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/login')
+            connection.getresponse().read()
+            connection.close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit('gunicorn did not start.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', help='SQLite file made by generate_data.py (left untouched)')
+    parser.add_argument('--path', default='/api/v1/rankings', help='authenticated read route to load')
+    parser.add_argument('--readers', type=int, default=8, help='logged-in clients loading --path')
+    parser.add_argument('--loggers', type=int, default=2, help='clients logging in over and over in the second phase')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per phase')
+    parser.add_argument('--worker-class', default='gthread', choices=['gthread', 'gevent'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='masnou-auth-load-')
+    copy = os.path.join(directory, 'load.db')
+    shutil.copyfile(args.database, copy)
+    add_user(copy)
+    print(f"{args.worker_class}: {args.workers} workers x {args.threads} threads, {args.readers} readers on {args.path}")
+    try:
+        for label, user_cache_seconds in (('user cache off', 0), ('user cache on', 60)):
+            port = free_port()
+            server = serve(copy, port, args, user_cache_seconds)
+            try:
+                # Warm the worker caches before measuring
+                run_phase(port, args.path, args.readers, 0, 1)
+                alone, _, errors = run_phase(port, args.path, args.readers, 0, args.duration)
+                loaded, logins, login_errors = run_phase(port, args.path, args.readers, args.loggers, args.duration)
+            finally:
+                server.terminate()
+                server.wait()
+            print(f'{label}:')
+            print(f'  {alone:>8.1f} requests/s alone')
+            print(f'  {loaded:>8.1f} requests/s with {args.loggers} clients logging in '
+                  f'({len(logins)} logins, {1000 * sum(logins) / max(len(logins), 1):.0f} ms each on average)')
+            for error in sorted(set(errors + login_errors)):
+                print(f'  error: {error}')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
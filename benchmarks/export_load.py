@@ -0,0 +1,218 @@
+"""
+Latency of the interactive pages while large exports download.
+
+Serves a copy of a database made by generate_data.py with gunicorn and
+gunicorn.conf.py, as deployed, and measures the ranking, results and player
+search routes twice: once alone, and once while --exporters clients keep
+adding a player and downloading the full /export:
+
+    python benchmarks/generate_data.py bench.db --players 10000 --tournaments 2000 --points 1000000
+    python benchmarks/export_load.py bench.db --exporters 4
+    python benchmarks/export_load.py bench.db --exporters 4 --worker-class gevent
+
+Each export follows a write, so no download reuses an earlier export's file.
+With --read-kib-per-second, exporters read like slow clients.
+"""
+
+import argparse
+import http.client
+import itertools
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def server_app():
+    """The app as gunicorn loads it here: logged in as nobody, without CSRF tokens."""
+    sys.path.insert(0, ROOT)
+    import app as masnou
+    return masnou.create_app({'WTF_CSRF_ENABLED': False, 'LOGIN_DISABLED': True})
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def request(port, method, path, data=None, headers=None, read_rate=None):
+    """Performs one request on a new connection. Returns (status, body length)."""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+    try:
+        body = urllib.parse.urlencode(data) if data else None
+        headers = dict(headers or {})
+        if body:
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        connection.request(method, path, body, headers)
+        response = connection.getresponse()
+        size = 0
+        while True:
+            chunk = response.read(64 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+            if read_rate:
+                time.sleep(len(chunk) / (read_rate * 1024))
+        return response.status, size
+    finally:
+        connection.close()
+
+
+def sample_inputs(database):
+    import sqlite3
+    connection = sqlite3.connect(database)
+    try:
+        tournament_ids = [row[0] for row in connection.execute('SELECT id FROM tournament')]
+        names = [row[0] for row in connection.execute('SELECT last_name FROM player ORDER BY random() LIMIT 100')]
+    finally:
+        connection.close()
+    return tournament_ids, names
+
+
+def interactive_routes(tournament_ids, names):
+    return [
+        ('index', lambda rng: ('GET', '/', None)),
+        ('view_results', lambda rng: ('POST', '/view_results', {'tournament': rng.choice(tournament_ids)})),
+        ('player search', lambda rng: ('GET', f'/api/v1/players?q={urllib.parse.quote(rng.choice(names)[:4])}', None)),
+    ]
+
+
+def letters(*numbers):
+    """A name made of letters only (the app drops digits from names) that is unique per numbers."""
+    name = ''
+    for number in numbers:
+        name += 'x'
+        while True:
+            number, digit = divmod(number, 26)
+            name += chr(ord('a') + digit)
+            if not number:
+                break
+    return name
+
+
+def run_phase(port, routes, readers, duration, exporters, read_rate):
+    latencies = {name: [] for name, _ in routes}
+    exports = []
+    errors = []
+    stop = threading.Event()
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            name, build = rng.choice(routes)
+            method, path, data = build(rng)
+            start = time.perf_counter()
+            status, _ = request(port, method, path, data)
+            latencies[name].append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(f'{name}: HTTP {status}')
+
+    def exporter(seed):
+        counter = itertools.count()
+        while not stop.is_set():
+            # A cheap write that moves the data version on, so this export is produced afresh
+            request(port, 'POST', '/add_player', {'first_name': 'Load', 'last_name': letters(seed, next(counter))})
+            start = time.perf_counter()
+            status, size = request(port, 'GET', '/export', headers={'Accept-Encoding': 'identity'},
+                                   read_rate=read_rate)
+            exports.append((time.perf_counter() - start, size))
+            if status != 200:
+                errors.append(f'export: HTTP {status}')
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=exporter, args=(1000 + n,)) for n in range(exporters)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, exports, errors
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def report(title, latencies, exports):
+    print(title)
+    print(f"  {'route':<16} {'requests':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, values in latencies.items():
+        if values:
+            print(f"  {name:<16} {len(values):>9} {1000 * percentile(values, 0.5):>9.1f} "
+                  f"{1000 * percentile(values, 0.95):>9.1f} {1000 * percentile(values, 0.99):>9.1f}")
+    if exports:
+        print(f"  exports: {len(exports)} of {statistics.mean(size for _, size in exports) / 2 ** 20:.1f} MiB, "
+              f"{statistics.mean(seconds for seconds, _ in exports):.2f}s on average")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', help='SQLite file made by generate_data.py (left untouched)')
+    parser.add_argument('--exporters', type=int, default=4, help='clients downloading /export at once')
+    parser.add_argument('--readers', type=int, default=4, help='clients loading the interactive pages')
+    parser.add_argument('--duration', type=float, default=15, help='seconds per phase')
+    parser.add_argument('--read-kib-per-second', type=float, help='throttle the exporters like slow clients')
+    parser.add_argument('--worker-class', default='gthread', choices=['gthread', 'gevent'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='masnou-export-load-')
+    copy = os.path.join(directory, 'load.db')
+    shutil.copyfile(args.database, copy)
+    tournament_ids, names = sample_inputs(copy)
+    port = free_port()
+    environment = dict(
+        os.environ,
+        DATABASE_URL=f'sqlite:///{copy}',
+        INSTANCE_PATH=os.path.join(directory, 'instance'),
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        GUNICORN_WORKER_CLASS=args.worker_class,
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+         '--chdir', directory, '--pythonpath', os.path.dirname(os.path.abspath(__file__)),
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'export_load:server_app()'],
+        env=environment,
+    )
+    try:
+        for _ in range(100):
+            try:
+                request(port, 'GET', '/')
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise SystemExit('gunicorn did not start.')
+
+        routes = interactive_routes(tournament_ids, names)
+        print(f"{args.worker_class}: {args.workers} workers x {args.threads} threads, {args.readers} readers")
+        latencies, _, errors = run_phase(port, routes, args.readers, args.duration, 0, None)
+        report('Interactive pages alone', latencies, [])
+        latencies, exports, export_errors = run_phase(
+            port, routes, args.readers, args.duration, args.exporters, args.read_kib_per_second
+        )
+        report(f'With {args.exporters} exports running', latencies, exports)
+        for error in sorted(set(errors + export_errors)):
+            print(f'  error: {error}')
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Synthetic tournament database for benchmarks.
+
+Fills the player, tournament and point tables of a new SQLite file at the
+given scale, then builds the derived tables (standings, timelines, ratings,
+search index) the way 'flask rebuild-standings' does:
+
+    python benchmarks/generate_data.py bench.db --players 10000 --tournaments 2000 --points 1000000
+
+The data is shaped like the real club's. A few regulars play most
+tournaments, and most players show up only a handful of times. Each player
+has a hidden strength that decides their category and how many points they
+score out of the rounds played. Tournaments are held on distinct dates,
+mostly on weekends. The same --seed always gives the same database.
+"""
+
+import argparse
+import datetime
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIRST_NAMES = [
+    'Jordi', 'Josep', 'Joan', 'Marc', 'Pau', 'Albert', 'Xavier', 'David', 'Carles', 'Oriol', 'Arnau', 'Pol',
+    'Maria', 'Anna', 'Laia', 'Marta', 'Nuria', 'Montserrat', 'Laura', 'Julia', 'Carla', 'Mireia', 'Elena',
+    'Jose', 'Antonio', 'Manuel', 'Francisco', 'Miguel', 'Sergio', 'Alex', 'Lucia', 'Paula', 'Sara', 'Clara',
+]
+LAST_NAMES = [
+    'Garcia', 'Martinez', 'Lopez', 'Sanchez', 'Rodriguez', 'Fernandez', 'Perez', 'Gonzalez', 'Puig', 'Vidal',
+    'Soler', 'Ferrer', 'Roca', 'Serra', 'Font', 'Pujol', 'Casas', 'Vila', 'Riera', 'Costa', 'Prat', 'Sala',
+    'Bosch', 'Mas', 'Camps', 'Batlle', 'Ribas', 'Torres', 'Navarro', 'Ruiz', 'Moreno', 'Jimenez', 'Romero',
+]
+SYLLABLES = ['ba', 'ca', 'da', 'fe', 'ga', 'la', 'ma', 'na', 'ra', 'sa', 'ta', 'vi', 'lo', 'mi', 'ro', 'ne']
+ROUNDS = 7
+
+
+def player_names(count, rng):
+    """Unique (first_name, last_name) pairs, common names first, already normalized."""
+    names = set()
+    while len(names) < count:
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        # Past the common combinations, compound surnames keep names unique
+        if len(names) > len(FIRST_NAMES) * len(LAST_NAMES) // 2:
+            last += ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+        names.add((first, last))
+    return sorted(names)
+
+
+def tournament_dates(count, rng, end=datetime.date(2025, 12, 31)):
+    """Distinct dates going back from end, mostly Saturdays and Sundays."""
+    dates = set()
+    day = end
+    while len(dates) < count:
+        day -= datetime.timedelta(days=1)
+        if day.weekday() >= 5 or rng.random() < 0.1:
+            dates.add(day)
+    return sorted(dates)
+
+
+def generate(database_url, instance_path, players, tournaments, points, seed=1, log=print):
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['INSTANCE_PATH'] = instance_path
+    import app as masnou
+    from sqlalchemy import insert
+
+    rng = random.Random(seed)
+    per_tournament = max(2, min(players, points // tournaments))
+    # Attendance follows a long tail: weight 1/rank**0.8 over a shuffled roster
+    attendance = [1 / (rank + 1) ** 0.8 for rank in range(players)]
+    rng.shuffle(attendance)
+    cumulative_attendance = list(itertools.accumulate(attendance))
+    strength = [rng.gauss(0, 1) for _ in range(players)]
+
+    with masnou.create_app().app_context():
+        db = masnou.db
+        db.drop_all()
+        db.create_all()
+
+        start = time.perf_counter()
+        db.session.execute(insert(masnou.Player), [
+            {'first_name': first_name, 'last_name': last_name}
+            for first_name, last_name in player_names(players, rng)
+        ])
+        db.session.execute(insert(masnou.Tournament), [
+            {'date': date} for date in tournament_dates(tournaments, rng)
+        ])
+        player_ids = [player_id for (player_id,) in db.session.query(masnou.Player.id).order_by(masnou.Player.id)]
+        tournament_ids = [
+            tournament_id for (tournament_id,) in db.session.query(masnou.Tournament.id).order_by(masnou.Tournament.id)
+        ]
+
+        total = 0
+        for tournament_id in tournament_ids:
+            entrants = set()
+            while len(entrants) < per_tournament:
+                entrants.update(rng.choices(
+                    range(players), cum_weights=cumulative_attendance, k=per_tournament - len(entrants)
+                ))
+            rows = []
+            for index in entrants:
+                # Stronger players play in A and score more of the rounds
+                category = 'A' if strength[index] + rng.gauss(0, 0.3) > 0 else 'B'
+                win_rate = 1 / (1 + 10 ** (-strength[index] / 2))
+                half_points = sum(rng.random() < win_rate for _ in range(2 * ROUNDS))
+                rows.append({
+                    'tournament_id': tournament_id,
+                    'player_id': player_ids[index],
+                    'points': half_points / 2,
+                    'category': category,
+                })
+            db.session.execute(insert(masnou.Point), rows)
+            total += len(rows)
+        db.session.commit()
+        log(f"Inserted {players} players, {tournaments} tournaments and {total} points "
+            f"in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        masnou.refresh_derived_data()
+        masnou.index_players()
+        db.session.commit()
+        log(f"Built the derived tables in {time.perf_counter() - start:.1f}s")
+        db.session.remove()
+        # Closing the last connection checkpoints the WAL into the database file, so a
+        # copy of that file alone (as the benchmarks make) holds every row
+        db.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', help='SQLite file to (re)create')
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--tournaments', type=int, default=200)
+    parser.add_argument('--points', type=int, default=40000, help='total results, spread evenly over tournaments')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(args.database + suffix):
+            os.remove(args.database + suffix)
+    # The data version and caches written along the way are not part of the dataset
+    with tempfile.TemporaryDirectory(prefix='masnou-generate-') as instance_path:
+        generate(f'sqlite:///{os.path.abspath(args.database)}', instance_path,
+                 args.players, args.tournaments, args.points, args.seed)
+
+
+if __name__ == '__main__':
+    main()
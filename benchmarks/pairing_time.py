@@ -0,0 +1,71 @@
+"""
+Time to pair a Swiss round against field size.
+
+Plays a whole simulated tournament per field size with pairing.pair_round():
+every round is paired from the scores and opponent history so far, and the
+results are drawn at random (stronger rating more likely to win). This is the
+same call the /tournament/<id>/rounds page makes, without the database:
+
+    python benchmarks/pairing_time.py --sizes 16 32 64 128 256 512 --rounds 9
+
+It prints the mean and worst pairing time per round for each field size.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pairing
+
+
+def simulate(players, rounds, rng):
+    ratings = {player: rng.gauss(1500, 200) for player in range(players)}
+    scores = dict.fromkeys(ratings, 0.0)
+    opponents = {player: set() for player in ratings}
+    colors = dict.fromkeys(ratings, 0)
+    byes = set()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        boards, bye = pairing.pair_round(list(ratings), scores, opponents, colors, byes, ratings)
+        timings.append(time.perf_counter() - start)
+        for white, black in boards:
+            expected = 1 / (1 + 10 ** ((ratings[black] - ratings[white]) / 400))
+            draw = rng.random() < 0.2
+            white_points = 0.5 if draw else float(rng.random() < expected)
+            scores[white] += white_points
+            scores[black] += 1 - white_points
+            opponents[white].add(black)
+            opponents[black].add(white)
+            colors[white] += 1
+            colors[black] -= 1
+        if bye is not None:
+            scores[bye] += pairing.BYE_POINTS
+            byes.add(bye)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 32, 64, 128, 256, 512])
+    parser.add_argument('--rounds', type=int, default=9)
+    parser.add_argument('--repeat', type=int, default=3, help='tournaments simulated per size')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'players':>8} {'mean ms':>10} {'worst ms':>10}")
+    for size in args.sizes:
+        timings = []
+        for _ in range(args.repeat):
+            timings.extend(simulate(size, min(args.rounds, size - 1), rng))
+        print(f"{size:>8} {1000 * sum(timings) / len(timings):>10.2f} {1000 * max(timings):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
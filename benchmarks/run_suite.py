@@ -0,0 +1,212 @@
+"""
+Latency, query count and memory of the main pages, with a saved baseline.
+
+Runs each scenario through the Flask test client against a copy of a database
+made by generate_data.py, so the writes of add_points never touch the
+original:
+
+    python benchmarks/generate_data.py bench.db
+    python benchmarks/run_suite.py bench.db --output baseline.json
+    ... change the code ...
+    python benchmarks/run_suite.py bench.db --compare baseline.json
+
+For every scenario it prints the p50/p95/p99 latency, SQL statements per
+request and the peak Python memory of one extra traced request. --output saves
+these with the commit they ran on. --compare fails (exit status 1) when a
+scenario's p50 or query count grew by more than --tolerance over the baseline.
+
+The rankings/chart cache is off by default, so every request computes its page.
+With --warm-cache, the read pages are measured as repeat visitors see them.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load_app(database_url, warm_cache, instance_path):
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['INSTANCE_PATH'] = instance_path
+    if not warm_cache:
+        os.environ['CACHE_BACKEND'] = 'none'
+    import app as masnou
+    return masnou, masnou.create_app({'WTF_CSRF_ENABLED': False, 'LOGIN_DISABLED': True})
+
+
+def scenarios(masnou, app, rng):
+    """(name, callable(client) -> response) pairs with inputs drawn from the database."""
+    with app.app_context():
+        session = masnou.db.session
+        tournament_ids = [
+            tournament_id for (tournament_id,) in
+            session.query(masnou.Tournament.id).order_by(masnou.Tournament.date.desc())
+        ]
+        player_ids = [player_id for (player_id,) in session.query(masnou.Player.id)]
+        years = sorted({date.year for (date,) in session.query(masnou.Tournament.date)})
+        taken = set(session.query(masnou.Point.player_id, masnou.Point.tournament_id))
+
+    def add_points(client):
+        # A player without a result yet in one of the latest tournaments, where results are
+        # entered in practice; a past tournament also replays the ratings of every later one
+        while True:
+            player_id, tournament_id = rng.choice(player_ids), rng.choice(tournament_ids[:5])
+            if (player_id, tournament_id) not in taken:
+                break
+        taken.add((player_id, tournament_id))
+        return client.post('/add_points', data={
+            'tournament': tournament_id, 'player': player_id, 'points': '2.5', 'category': 'A'
+        })
+
+    def export_data(client):
+        # Every download of an unchanged database after the first would read the finished
+        # spool file; removing it makes each request measure the export itself
+        shutil.rmtree(os.path.join(app.instance_path, 'exports'), ignore_errors=True)
+        response = client.get('/export')
+        # Streamed: the rows are produced while the body is read
+        response.get_data()
+        return response
+
+    return [
+        ('index', lambda client: client.get('/')),
+        ('view_results', lambda client: client.post('/view_results', data={'tournament': rng.choice(tournament_ids)})),
+        ('progression', lambda client: client.post('/progression', data={
+            'players': rng.sample(player_ids, min(5, len(player_ids))), 'series': 'rank', 'window': 5
+        })),
+        ('visualization (tournament)', lambda client: client.post('/visualization', data={
+            'visualization_type': 'tournament', 'specific_tournament': rng.choice(tournament_ids), 'specific_top_n': 5
+        })),
+        ('visualization (general)', lambda client: client.post('/visualization', data={
+            'visualization_type': 'general', 'year': rng.choice(years), 'general_top_n': 10
+        })),
+        ('export_data', export_data),
+        ('add_points', add_points),
+    ]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(masnou, name, run, client, requests):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+
+    def count(*args):
+        statements[-1] += 1
+
+    event.listen(Engine, 'before_cursor_execute', count)
+    try:
+        latencies = []
+        for _ in range(requests):
+            statements.append(0)
+            start = time.perf_counter()
+            response = run(client)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code not in (200, 302):
+                raise SystemExit(f'{name}: HTTP {response.status_code}')
+    finally:
+        event.remove(Engine, 'before_cursor_execute', count)
+
+    tracemalloc.start()
+    run(client)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'requests': requests,
+        'p50_ms': round(1000 * percentile(latencies, 0.50), 2),
+        'p95_ms': round(1000 * percentile(latencies, 0.95), 2),
+        'p99_ms': round(1000 * percentile(latencies, 0.99), 2),
+        'mean_ms': round(1000 * statistics.mean(latencies), 2),
+        'queries': round(statistics.mean(statements), 1),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing the regressions of results against baseline."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'queries'):
+            if result[metric] > before[metric] * (1 + tolerance) and result[metric] - before[metric] > 0.5:
+                regressions.append(f'{name}: {metric} {before[metric]} -> {result[metric]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', help='SQLite file made by generate_data.py (left untouched)')
+    parser.add_argument('--requests', type=int, default=50, help='timed requests per scenario')
+    parser.add_argument('--warm-cache', action='store_true', help='keep the rankings/chart cache enabled')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative growth (default 20%%)')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='masnou-suite-')
+    copy = os.path.join(directory, 'suite.db')
+    shutil.copyfile(args.database, copy)
+    try:
+        masnou, app = load_app(f'sqlite:///{copy}', args.warm_cache, os.path.join(directory, 'instance'))
+        client = app.test_client()
+        results = {}
+        print(f"{'scenario':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KiB':>10}")
+        for name, run in scenarios(masnou, app, random.Random(args.seed)):
+            result = results[name] = measure(masnou, name, run, client, args.requests)
+            print(f"{name:<28} {result['p50_ms']:>9} {result['p95_ms']:>9} {result['p99_ms']:>9} "
+                  f"{result['queries']:>8} {result['peak_kib']:>10}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({
+                'commit': git_commit(),
+                'database': os.path.basename(args.database),
+                'requests': args.requests,
+                'warm_cache': args.warm_cache,
+                'scenarios': results,
+            }, output, indent=2)
+        print(f'Saved {args.output}')
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions against {baseline.get('commit') or args.compare}:")
+            for line in regressions:
+                print(f'  {line}')
+            sys.exit(1)
+        print(f"No regressions against {baseline.get('commit') or args.compare}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Cold start of a web worker: the time from its start until it has answered a
+first request on each of the main pages, measured in fresh processes on a
+copy of a database made by generate_data.py:
+
+    python benchmarks/worker_startup.py bench.db --runs 5
+
+Three ways of starting a worker are compared:
+
+    import          a new interpreter imports app.py and compiles each template
+                    on its first render (gunicorn without preload_app)
+    import, cached  the same, with the templates in the shared bytecode cache
+                    that `flask bootstrap` fills
+    preload         forked from a process that imported app.py, as gunicorn's
+                    preload_app does, with the bytecode cache
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+START = time.perf_counter()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ['/', '/view_players', '/view_tournaments', '/view_results', '/api/v1/rankings', '/export_page']
+MODES = ['import', 'import, cached', 'preload']
+
+
+def load_app():
+    sys.path.insert(0, ROOT)
+    import app as masnou
+    return masnou.create_app({'WTF_CSRF_ENABLED': False, 'LOGIN_DISABLED': True})
+
+
+def first_requests(app):
+    client = app.test_client()
+    for path in PAGES:
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path}: HTTP {response.status_code}')
+
+
+def child(mode, runs):
+    """Runs in a new interpreter; prints one JSON line per measured worker start."""
+    if mode == 'preload':
+        app = load_app()
+        for _ in range(runs):
+            read_end, write_end = os.pipe()
+            start = time.perf_counter()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_end)
+                first_requests(app)
+                os.write(write_end, json.dumps({'import': 0, 'requests': time.perf_counter() - start}).encode())
+                os._exit(0)
+            os.close(write_end)
+            with os.fdopen(read_end) as result:
+                print(result.read(), flush=True)
+            os.waitpid(pid, 0)
+        return
+    app = load_app()
+    imported = time.perf_counter()
+    if mode == 'import':
+        app.jinja_env.bytecode_cache = None
+    first_requests(app)
+    print(json.dumps({'import': imported - START, 'requests': time.perf_counter() - imported}), flush=True)
+
+
+def measure(mode, runs, environment):
+    script = os.path.abspath(__file__)
+    command = [sys.executable, script, '--child', mode]
+    if mode == 'preload':
+        output = subprocess.run(command + ['--runs', str(runs)], env=environment,
+                                check=True, capture_output=True, text=True).stdout
+        return [json.loads(line) for line in output.splitlines()]
+    return [
+        json.loads(subprocess.run(command, env=environment, check=True, capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', nargs='?', help='SQLite file made by generate_data.py (left untouched)')
+    parser.add_argument('--runs', type=int, default=5, help='worker starts measured per mode')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.runs)
+        return
+    if not args.database:
+        parser.error('the database argument is required')
+
+    directory = tempfile.mkdtemp(prefix='masnou-startup-')
+    copy = os.path.join(directory, 'startup.db')
+    shutil.copyfile(args.database, copy)
+    environment = dict(os.environ, DATABASE_URL=f'sqlite:///{copy}', INSTANCE_PATH=os.path.join(directory, 'instance'))
+    try:
+        # What `flask bootstrap` does before the workers start
+        no_users = os.path.join(directory, 'users.json')
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'bootstrap', '--users', no_users],
+                       cwd=ROOT, env=environment, check=True, capture_output=True)
+        print(f"{'worker start':<16} {'import ms':>10} {'first pages ms':>15} {'total ms':>10}")
+        for mode in MODES:
+            results = measure(mode, args.runs, environment)
+            imported = statistics.median(1000 * result['import'] for result in results)
+            requests = statistics.median(1000 * result['requests'] for result in results)
+            total = statistics.median(1000 * (result['import'] + result['requests']) for result in results)
+            print(f'{mode:<16} {imported:>10.0f} {requests:>15.0f} {total:>10.0f}')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
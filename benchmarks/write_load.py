@@ -0,0 +1,140 @@
+"""
+Write throughput of concurrent result entry against SQLite.
+
+Starts several processes, like gunicorn workers, that each post scores to
+/add_points through the Flask test client on a scratch database, while other
+processes keep loading the ranking page. This is run once per storage profile:
+
+    python benchmarks/write_load.py --workers 4 --readers 2 --writes 200
+
+It prints writes per second and the number of failed requests ("database is
+locked") for each profile. Use --directory to place the database on the disk
+you deploy on, since fsync cost is what synchronous=NORMAL saves.
+
+To compare with PostgreSQL, pass the URL of a scratch database (its tables
+are dropped and recreated):
+
+    python benchmarks/write_load.py --postgres postgresql://localhost/masnou_bench
+"""
+
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load_app(database_url, profile):
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['STORAGE_PROFILE'] = profile
+    import app as masnou
+    return masnou, masnou.create_app({'WTF_CSRF_ENABLED': False, 'LOGIN_DISABLED': True})
+
+
+def seed(database_url, profile, players, tournaments):
+    masnou, app = load_app(database_url, profile)
+    with app.app_context():
+        masnou.db.drop_all()
+        masnou.db.create_all()
+        masnou.db.session.add_all(
+            masnou.Player(first_name=f'Player{n}', last_name='Bench') for n in range(players)
+        )
+        start = datetime.date(2000, 1, 1)
+        masnou.db.session.add_all(
+            masnou.Tournament(date=start + datetime.timedelta(days=n)) for n in range(tournaments)
+        )
+        masnou.db.session.commit()
+
+
+def writer(args):
+    database_url, profile, worker, workers, writes, tournaments = args
+    _, app = load_app(database_url, profile)
+    client = app.test_client()
+    failures = 0
+    start = time.perf_counter()
+    for n in range(writes):
+        # Each worker owns a disjoint set of players, so writes never conflict on uix_player_tournament
+        player_id = 1 + worker + workers * (n // tournaments)
+        tournament_id = 1 + n % tournaments
+        response = client.post('/add_points', data={
+            'tournament': tournament_id,
+            'player': player_id,
+            'points': '1.5',
+            'category': 'A',
+        })
+        if response.status_code != 302:
+            failures += 1
+    return time.perf_counter() - start, failures
+
+
+def reader(args):
+    database_url, profile, reads = args
+    _, app = load_app(database_url, profile)
+    client = app.test_client()
+    failures = 0
+    for _ in range(reads):
+        if client.get('/').status_code != 200:
+            failures += 1
+    return failures
+
+
+def run(profile, workers, readers, writes, tournaments, directory=None, database_url=None):
+    directory = tempfile.mkdtemp(prefix='masnou-bench-', dir=directory)
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    # Inherited by the spawned seed, writer and reader processes
+    os.environ['INSTANCE_PATH'] = os.path.join(directory, 'instance')
+    players = workers * (writes // tournaments + 1)
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        pool.apply(seed, (database_url, profile, players, tournaments))
+
+    start = time.perf_counter()
+    with context.Pool(workers + readers) as pool:
+        reads = pool.map_async(reader, [(database_url, profile, writes) for _ in range(readers)])
+        results = pool.map(writer, [
+            (database_url, profile, worker, workers, writes, tournaments) for worker in range(workers)
+        ])
+        elapsed = time.perf_counter() - start
+        failed_reads = sum(reads.get())
+    failures = sum(failed for _, failed in results)
+    total = workers * writes
+    return {
+        'profile': profile,
+        'writes': total,
+        'failed': failures,
+        'failed_reads': failed_reads,
+        'seconds': round(elapsed, 2),
+        'writes_per_second': round((total - failures) / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--writes', type=int, default=200, help='writes per worker (and reads per reader)')
+    parser.add_argument('--directory', help='where to create the scratch database')
+    parser.add_argument('--tournaments', type=int, default=50)
+    parser.add_argument('--profiles', nargs='+', default=['default', 'concurrent'])
+    parser.add_argument('--postgres', help='also run against this scratch PostgreSQL database URL')
+    args = parser.parse_args()
+
+    runs = [(profile, None) for profile in args.profiles]
+    if args.postgres:
+        # Storage profiles only apply to SQLite
+        runs.append(('postgresql', args.postgres))
+    for profile, database_url in runs:
+        result = run(profile, args.workers, args.readers, args.writes, args.tournaments, args.directory, database_url)
+        print(f"{result['profile']:>10}: {result['writes_per_second']:>8} writes/s, "
+              f"{result['failed']} failed writes of {result['writes']}, "
+              f"{result['failed_reads']} failed reads, {result['seconds']}s")
+
+
+if __name__ == '__main__':
+    main()
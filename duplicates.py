@@ -0,0 +1,72 @@
+# duplicates.py
+"""
+Finds players entered more than once under slightly different names:
+"Josep Maria" / "Josepmaria", first and last name swapped, a typo. Names are
+first grouped by cheap blocking keys, and only names sharing a block are
+compared with a string similarity, so the roster is never compared pair by
+pair.
+"""
+
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+THRESHOLD = 0.85
+# Blocks larger than this are too common a key to say anything (e.g. a frequent surname)
+MAX_BLOCK_SIZE = 200
+
+
+def _letters(name):
+    return ''.join(character for character in name.lower() if character.isalpha())
+
+
+def blocking_keys(first_name, last_name):
+    first, last = _letters(first_name), _letters(last_name)
+    full = first + last
+    return {
+        # Same letters split differently between first and last name
+        'full:' + full,
+        # Swapped first and last name
+        'pair:' + '|'.join(sorted((first, last))),
+        # Typos away from the start of either name
+        'start:' + first[:2] + last[:3],
+        'start:' + last[:2] + first[:3],
+        # Typos near the start of the name
+        'end:' + full[-4:],
+        'letters:' + ''.join(sorted(full)),
+    }
+
+
+def similarity(a, b):
+    """Similarity of two (first_name, last_name) pairs, taking the better of both name orders."""
+    first_a, last_a = _letters(a[0]), _letters(a[1])
+    first_b, last_b = _letters(b[0]), _letters(b[1])
+    straight = SequenceMatcher(None, first_a + last_a, first_b + last_b).ratio()
+    swapped = SequenceMatcher(None, first_a + last_a, last_b + first_b).ratio()
+    return max(straight, swapped)
+
+
+def find_duplicates(players, threshold=THRESHOLD):
+    """
+    players is an iterable of (id, first_name, last_name).
+    Returns [(score, id_a, id_b)] for every pair at least threshold similar,
+    most similar first.
+    """
+    names = {}
+    blocks = defaultdict(list)
+    for player_id, first_name, last_name in players:
+        names[player_id] = (first_name, last_name)
+        for key in blocking_keys(first_name, last_name):
+            blocks[key].append(player_id)
+
+    scores = {}
+    for members in blocks.values():
+        if len(members) > MAX_BLOCK_SIZE:
+            continue
+        for id_a, id_b in combinations(sorted(members), 2):
+            if (id_a, id_b) not in scores:
+                scores[(id_a, id_b)] = similarity(names[id_a], names[id_b])
+    return sorted(
+        ((round(score, 3), id_a, id_b) for (id_a, id_b), score in scores.items() if score >= threshold),
+        key=lambda candidate: (-candidate[0], candidate[1], candidate[2])
+    )
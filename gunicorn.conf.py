@@ -0,0 +1,45 @@
+# gunicorn.conf.py
+# Loaded automatically by `gunicorn 'app:create_app()'` (see Procfile).
+
+import os
+import sys
+
+# A few processes with several threads each. SQLite allows one writer at a
+# time, so more threads per worker are cheaper than more workers; the
+# "concurrent" storage profile in app.py makes writers queue instead of failing.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+
+# 'gthread' (default) or 'gevent' (pip install -r requirements-gevent.txt). gthread
+# serves a request per thread; slow downloads and live scoreboard streams each hold
+# one, and exports are produced by app.py's export threads either way. gevent serves
+# every connection from a greenlet, so hundreds of idle streams cost little. The app's database
+# sessions are scoped to the app context, which works for threads and greenlets
+# alike. SQLite queries still block the whole worker while they run, so use gevent
+# with PostgreSQL; psycopg2 is made cooperative below when psycogreen is installed.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'gevent':
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 200))
+
+# Import app.py once in the master and fork the workers from it, so a worker (also one
+# restarted after a crash or timeout) starts in milliseconds instead of importing Flask,
+# SQLAlchemy and the app again, and the workers share those pages of memory. Not with
+# gevent, which has to patch the standard library in each worker before the app is imported.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '0' if worker_class == 'gevent' else '1') == '1'
+
+
+def post_fork(server, worker):
+    # The app create_app() built in the master, with preload_app
+    flask_app = server.app.callable
+    masnou = sys.modules.get('app')
+    if flask_app is not None and masnou is not None:
+        # Pooled connections opened in the master must not be shared with the workers
+        with flask_app.app_context():
+            masnou.db.engine.dispose(close=False)
+    if worker_class == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            return
+        patch_psycopg()
@@ -0,0 +1,74 @@
+# metrics.py
+"""
+Minimal Prometheus metrics: labelled histograms kept in memory and rendered in
+the Prometheus text exposition format. Values are per process, so with several
+gunicorn workers each scrape sees the worker that answered it.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import deque
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    def __init__(self, name, description, label, buckets):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = buckets
+        self._series = {}  # label value -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {label_value: list(values) for label_value, values in self._series.items()}
+        for label_value, values in sorted(series.items()):
+            label = f'{self.label}="{_escape(label_value)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{_number(bound)}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {values[-1]}')
+            lines.append(f'{self.name}_sum{{{label}}} {_number(values[-2])}')
+            lines.append(f'{self.name}_count{{{label}}} {values[-1]}')
+        return '\n'.join(lines)
+
+
+class Registry:
+    def __init__(self, slow_query_log_size=100):
+        self.histograms = []
+        # Most recent slow statements, newest last
+        self.slow_queries = deque(maxlen=slow_query_log_size)
+
+    def histogram(self, name, description, label, buckets=TIME_BUCKETS):
+        histogram = Histogram(name, description, label, buckets)
+        self.histograms.append(histogram)
+        return histogram
+
+    def render(self):
+        return '\n'.join(histogram.render() for histogram in self.histograms) + '\n'
@@ -0,0 +1,276 @@
+# migrations/__init__.py
+"""
+Versioned schema migrations. Every file in migrations/versions is named
+NNNN_description.py and defines upgrade(context). The versions already applied
+are recorded in the schema_migrations table, and the pending ones run in order:
+
+    flask --app app migrate
+
+A migration must be safe to run on a database that already has its changes,
+because databases set up before migrations existed have some of them already.
+It should therefore use the checkfirst helpers of MigrationContext.
+Table definitions inside a migration are frozen copies, not the models,
+so old migrations keep creating the schema they were written for.
+
+Backfills are not frozen: they fill derived tables through the app's current
+refresh functions (context.models), which write the current columns. A
+migration therefore registers them with context.backfill(), and they run only
+after every pending migration has changed the schema, against the schema that
+code expects. A migration with backfills is recorded once they have finished,
+so an interrupted backfill runs again with the next upgrade. Backfills must
+therefore be idempotent: the refresh functions rewrite the rows of the players
+they are given, so refilling every chunk gives the same table.
+
+Backfills run in chunks, each committed on its own with a short pause between
+chunks. Writers from the running app get the database in between, and a large
+point table is never held under a single write lock.
+"""
+
+import datetime
+import importlib.util
+import os
+import re
+import time
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, insert, select, text
+
+VERSIONS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'versions')
+VERSION_FILE = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', metadata,
+    Column('version', String(20), primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f'migrations.versions.v{self.version}', self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    @property
+    def description(self):
+        return (self.module.__doc__ or self.name.replace('_', ' ')).strip().splitlines()[0]
+
+
+def discover():
+    migrations = []
+    for filename in sorted(os.listdir(VERSIONS_FOLDER)):
+        match = VERSION_FILE.match(filename)
+        if match:
+            migrations.append(Migration(match.group(1), match.group(2), os.path.join(VERSIONS_FOLDER, filename)))
+    return migrations
+
+
+def applied_versions(engine):
+    metadata.create_all(engine)
+    with engine.connect() as connection:
+        return {version for (version,) in connection.execute(select(schema_migrations.c.version))}
+
+
+def pending(engine):
+    applied = applied_versions(engine)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+class MigrationContext:
+    """What a migration's upgrade() works with: DDL helpers and chunked backfills."""
+
+    def __init__(self, engine, session, models, log=print, chunk_size=1000, pause=0.05):
+        self.engine = engine
+        self.session = session
+        # The app module, for backfills through its models and refresh functions
+        self.models = models
+        self.log = log
+        self.chunk_size = chunk_size
+        self.pause = pause
+        # (migration, work) pairs, run once the schema is up to date
+        self.backfills = []
+        self.migration = None
+
+    @property
+    def dialect(self):
+        return self.engine.dialect.name
+
+    def execute(self, statement, params=None):
+        """Runs one statement in its own transaction."""
+        with self.engine.begin() as connection:
+            return connection.execute(text(statement) if isinstance(statement, str) else statement, params or {})
+
+    def has_table(self, name):
+        return inspect(self.engine).has_table(name)
+
+    def has_column(self, table_name, column_name):
+        return any(column['name'] == column_name for column in inspect(self.engine).get_columns(table_name))
+
+    def has_index(self, table_name, index_name):
+        return inspect(self.engine).has_index(table_name, index_name)
+
+    def reflect(self, *table_names):
+        """A MetaData holding the existing tables, for foreign keys of frozen definitions."""
+        metadata = MetaData()
+        metadata.reflect(self.engine, only=table_names)
+        return metadata
+
+    def create_table(self, table):
+        """Creates a frozen table definition (and its indexes) unless it exists. Returns True if created."""
+        if self.has_table(table.name):
+            return False
+        table.create(self.engine)
+        return True
+
+    def create_index(self, name, table_name, columns, unique=False):
+        """
+        CREATE INDEX unless it exists. columns is SQL, e.g. 'tournament_id, points DESC'.
+        PostgreSQL builds it CONCURRENTLY, without blocking writes; SQLite holds its
+        write lock while it builds, which is one pass over the table.
+        """
+        if self.has_index(table_name, name):
+            return
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        if self.dialect == 'postgresql':
+            # CONCURRENTLY cannot run inside a transaction block
+            with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                connection.execute(text(f'CREATE {kind} CONCURRENTLY {name} ON {table_name} ({columns})'))
+        else:
+            self.execute(f'CREATE {kind} {name} ON {table_name} ({columns})')
+        self.log(f'  created index {name}')
+
+    def drop_index(self, name, table_name):
+        """DROP INDEX if it exists, e.g. once a new index covers what it served."""
+        if not self.has_index(table_name, name):
+            return
+        self.execute(f'DROP INDEX {name}')
+        self.log(f'  dropped index {name}')
+
+    def recreate_table(self, table, copy_columns=None):
+        """
+        SQLite's batch-mode ALTER: builds the new definition of a table under a
+        temporary name, copies the rows, and swaps it in, all in one transaction.
+        This covers the changes SQLite's ALTER TABLE cannot make, such as
+        dropping or retyping a column or changing constraints. copy_columns maps
+        new column names to SQL expressions over the old table. By default the
+        columns present in both are copied.
+        Only for SQLite: a migration changes the table with ALTER TABLE elsewhere.
+        """
+        if self.dialect != 'sqlite':
+            raise ValueError(f'recreate_table() is for SQLite; use ALTER TABLE on {self.dialect}.')
+        old_columns = {column['name'] for column in inspect(self.engine).get_columns(table.name)}
+        if copy_columns is None:
+            copy_columns = {column.name: column.name for column in table.columns if column.name in old_columns}
+        temporary_name = f'_migrate_{table.name}'
+        # In the same MetaData, so its foreign keys resolve
+        temporary = table.to_metadata(table.metadata, name=temporary_name)
+        # Index names are global in SQLite; they are created on the final table below
+        temporary.indexes.clear()
+        with self.engine.connect() as connection:
+            # Foreign key checks would see the table disappear for a moment. The setting
+            # stays with the pooled connection, so it is put back as it was afterwards.
+            foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+            try:
+                with connection.begin():
+                    temporary.create(connection)
+                    targets = ', '.join(copy_columns)
+                    sources = ', '.join(copy_columns.values())
+                    connection.exec_driver_sql(
+                        f'INSERT INTO {temporary_name} ({targets}) SELECT {sources} FROM {table.name}'
+                    )
+                    connection.exec_driver_sql(f'DROP TABLE {table.name}')
+                    connection.exec_driver_sql(f'ALTER TABLE {temporary_name} RENAME TO {table.name}')
+                    for index in table.indexes:
+                        index.create(connection)
+                    violation = connection.exec_driver_sql(f'PRAGMA foreign_key_check({table.name})').first()
+                    if violation is not None:
+                        raise ValueError(f'Rebuilding {table.name} breaks a foreign key: {tuple(violation)}')
+            finally:
+                connection.exec_driver_sql(f'PRAGMA foreign_keys={int(foreign_keys)}')
+                connection.commit()
+                table.metadata.remove(temporary)
+        self.log(f'  rebuilt table {table.name}')
+
+    def backfill(self, work):
+        """Runs work() after the schema changes of every pending migration, e.g. a call to in_chunks()."""
+        self.backfills.append((self.migration, work))
+
+    def in_chunks(self, keys, work, label='rows'):
+        """
+        Calls work(chunk) for successive chunks of keys, committing the session
+        after each one and pausing briefly so other writers are not starved.
+        """
+        keys = list(keys)
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start:start + self.chunk_size]
+            try:
+                work(chunk)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            self.log(f'  {min(start + self.chunk_size, len(keys))}/{len(keys)} {label}')
+            time.sleep(self.pause)
+
+    def repeat(self, work, label='steps'):
+        """Calls work() and commits until it returns 0, e.g. a resumable backfill with a limit."""
+        done = 0
+        while True:
+            try:
+                count = work()
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+            if not count:
+                return done
+            done += count
+            self.log(f'  {done} {label}')
+            time.sleep(self.pause)
+
+
+def _record(engine, migration):
+    with engine.begin() as connection:
+        connection.execute(insert(schema_migrations), {
+            'version': migration.version,
+            'description': migration.description[:200],
+            'applied_at': datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None),
+        })
+
+
+def upgrade(engine, session, models, log=print, chunk_size=1000, pause=0.05):
+    """Applies the pending migrations in version order. Returns the versions applied."""
+    context = MigrationContext(engine, session, models, log, chunk_size, pause)
+    migrations = pending(engine)
+    for migration in migrations:
+        log(f'Applying {migration.version} {migration.description}')
+        context.migration = migration
+        migration.module.upgrade(context)
+        if all(owner is not migration for owner, _ in context.backfills):
+            _record(engine, migration)
+    for migration in migrations:
+        works = [work for owner, work in context.backfills if owner is migration]
+        if works:
+            log(f'Backfilling {migration.version} {migration.description}')
+            for work in works:
+                work()
+            _record(engine, migration)
+    return [migration.version for migration in migrations]
+
+
+def stamp(engine):
+    """Records every migration as applied, for a schema made some other way (e.g. copy-db)."""
+    for migration in pending(engine):
+        _record(engine, migration)
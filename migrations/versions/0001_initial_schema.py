@@ -0,0 +1,43 @@
+"""Users, players, tournaments and points"""
+
+from sqlalchemy import (
+    Column, Date, Float, ForeignKey, Integer, MetaData, String, Table, UniqueConstraint
+)
+
+metadata = MetaData()
+
+user = Table(
+    'user', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('username', String(100), unique=True, nullable=False),
+    Column('password', String(200), nullable=False),
+)
+
+player = Table(
+    'player', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('first_name', String(100), nullable=False),
+    Column('last_name', String(100), nullable=False),
+    UniqueConstraint('first_name', 'last_name', name='uix_first_last_name'),
+)
+
+tournament = Table(
+    'tournament', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('date', Date, nullable=False, unique=True),
+)
+
+point = Table(
+    'point', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('tournament_id', Integer, ForeignKey('tournament.id'), nullable=False),
+    Column('player_id', Integer, ForeignKey('player.id'), nullable=False),
+    Column('points', Float, nullable=False),
+    Column('category', String(1), nullable=False),
+    UniqueConstraint('player_id', 'tournament_id', name='uix_player_tournament'),
+)
+
+
+def upgrade(context):
+    for table in metadata.sorted_tables:
+        context.create_table(table)
@@ -0,0 +1,5 @@
+"""Index for the per-tournament result lists"""
+
+
+def upgrade(context):
+    context.create_index('ix_point_tournament_category_points', 'point', 'tournament_id, category, points DESC')
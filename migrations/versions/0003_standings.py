@@ -0,0 +1,36 @@
+"""Standing and year_standing tables, filled from the point table"""
+
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, Table
+
+
+def upgrade(context):
+    metadata = context.reflect('player')
+    tables = [
+        Table(
+            'standing', metadata,
+            Column('player_id', Integer, ForeignKey('player.id'), primary_key=True),
+            Column('total_points', Float, nullable=False),
+            Column('tournaments_played', Integer, nullable=False),
+            Column('category_a_points', Float, nullable=False),
+            Column('category_b_points', Float, nullable=False),
+            Index('ix_standing_total_points', 'total_points'),
+        ),
+        Table(
+            'year_standing', metadata,
+            Column('player_id', Integer, ForeignKey('player.id'), primary_key=True),
+            Column('year', Integer, primary_key=True),
+            Column('total_points', Float, nullable=False),
+            Column('tournaments_played', Integer, nullable=False),
+            Index('ix_year_standing_year_total_points', 'year', 'total_points'),
+        ),
+    ]
+    for table in tables:
+        context.create_table(table)
+
+    context.backfill(lambda: backfill(context))
+
+
+def backfill(context):
+    models = context.models
+    player_ids = [player_id for (player_id,) in context.session.query(models.Player.id).order_by(models.Player.id)]
+    context.in_chunks(player_ids, models.refresh_standings, 'players')
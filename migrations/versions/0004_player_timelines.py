@@ -0,0 +1,25 @@
+"""Player_timeline table, filled from the point table"""
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, Table
+
+
+def upgrade(context):
+    metadata = context.reflect('player')
+    context.create_table(Table(
+        'player_timeline', metadata,
+        Column('player_id', Integer, ForeignKey('player.id'), primary_key=True),
+        Column('tournament_id', Integer, primary_key=True),
+        Column('date', Date, nullable=False),
+        Column('points', Float, nullable=False),
+        Column('cumulative_points', Float, nullable=False),
+        Index('ix_player_timeline_player_date', 'player_id', 'date'),
+        Index('ix_player_timeline_date', 'date'),
+    ))
+
+    context.backfill(lambda: backfill(context))
+
+
+def backfill(context):
+    models = context.models
+    player_ids = [player_id for (player_id,) in context.session.query(models.Player.id).order_by(models.Player.id)]
+    context.in_chunks(player_ids, models.refresh_timelines, 'players')
@@ -0,0 +1,32 @@
+"""Rating_history and rating_checkpoint tables, rated tournament by tournament"""
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, String, Table
+
+# Tournaments rated per transaction
+TOURNAMENTS_PER_STEP = 20
+
+
+def upgrade(context):
+    metadata = context.reflect('player')
+    context.create_table(Table(
+        'rating_history', metadata,
+        Column('player_id', Integer, ForeignKey('player.id'), primary_key=True),
+        Column('tournament_id', Integer, primary_key=True),
+        Column('date', Date, nullable=False),
+        Column('category', String(1), nullable=False),
+        Column('rating_before', Float, nullable=False),
+        Column('rating', Float, nullable=False),
+        Index('ix_rating_history_player_date', 'player_id', 'date'),
+        Index('ix_rating_history_date', 'date'),
+    ))
+    context.create_table(Table(
+        'rating_checkpoint', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('processed_through', Date, nullable=True),
+    ))
+
+    # Each step resumes after the checkpoint the previous one committed, so does a rerun
+    # after an interrupted backfill
+    context.backfill(lambda: context.repeat(
+        lambda: context.models.refresh_ratings(limit=TOURNAMENTS_PER_STEP), 'tournaments'
+    ))
@@ -0,0 +1,26 @@
+"""Round and pairing tables for Swiss rounds"""
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table, UniqueConstraint
+
+
+def upgrade(context):
+    metadata = context.reflect('player', 'tournament')
+    round_table = Table(
+        'round', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('tournament_id', Integer, ForeignKey('tournament.id'), nullable=False),
+        Column('category', String(1), nullable=False),
+        Column('number', Integer, nullable=False),
+        UniqueConstraint('tournament_id', 'category', 'number', name='uix_round_tournament_category_number'),
+    )
+    pairing = Table(
+        'pairing', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('round_id', Integer, ForeignKey('round.id'), nullable=False),
+        Column('white_id', Integer, ForeignKey('player.id'), nullable=False),
+        Column('black_id', Integer, ForeignKey('player.id'), nullable=True),
+        Column('result', String(7), nullable=True),
+        Index('ix_pairing_round', 'round_id'),
+    )
+    context.create_table(round_table)
+    context.create_table(pairing)
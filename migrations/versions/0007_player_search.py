@@ -0,0 +1,15 @@
+"""Trigram search index of player names (SQLite only)"""
+
+
+def upgrade(context):
+    if context.dialect != 'sqlite':
+        # Other databases search the player table with LIKE
+        return
+    context.execute("CREATE VIRTUAL TABLE IF NOT EXISTS player_search USING fts5(name, tokenize='trigram')")
+    context.backfill(lambda: backfill(context))
+
+
+def backfill(context):
+    models = context.models
+    player_ids = [player_id for (player_id,) in context.session.query(models.Player.id).order_by(models.Player.id)]
+    context.in_chunks(player_ids, models.index_players, 'players')
@@ -0,0 +1,22 @@
+"""Job table for the background job runner"""
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, MetaData, String, Table, Text
+
+
+def upgrade(context):
+    context.create_table(Table(
+        'job', MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('kind', String(50), nullable=False),
+        Column('key', String(200), nullable=False),
+        Column('params', Text, nullable=False),
+        Column('status', String(10), nullable=False),
+        Column('progress', Float, nullable=False),
+        Column('message', String(200), nullable=True),
+        Column('result', Text, nullable=True),
+        Column('worker', String(100), nullable=True),
+        Column('created_at', DateTime, nullable=False),
+        Column('started_at', DateTime, nullable=True),
+        Column('finished_at', DateTime, nullable=True),
+        Index('ix_job_status_key', 'status', 'key'),
+    ))
@@ -0,0 +1,7 @@
+"""Index for the yearly ranking ordered by points and player"""
+
+
+def upgrade(context):
+    context.create_index('ix_year_standing_year_points_player', 'year_standing', 'year, total_points, player_id')
+    # The new index serves every lookup the old one did
+    context.drop_index('ix_year_standing_year_total_points', 'year_standing')
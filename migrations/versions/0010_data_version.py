@@ -0,0 +1,14 @@
+"""Data_version table, the data version shared by app hosts on PostgreSQL"""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+
+
+def upgrade(context):
+    # Created on SQLite as well, which keeps its version in the instance folder,
+    # so every database has the tables copy-db copies
+    context.create_table(Table(
+        'data_version', MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('version', String(32), nullable=False),
+        Column('changed_at', DateTime, nullable=True),
+    ))
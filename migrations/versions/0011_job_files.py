@@ -0,0 +1,13 @@
+"""Job_file_chunk table holding the files jobs produce"""
+
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, Table
+
+
+def upgrade(context):
+    metadata = context.reflect('job')
+    context.create_table(Table(
+        'job_file_chunk', metadata,
+        Column('job_id', Integer, ForeignKey('job.id'), primary_key=True),
+        Column('number', Integer, primary_key=True),
+        Column('data', LargeBinary, nullable=False),
+    ))
@@ -0,0 +1,124 @@
+# pairing.py
+"""
+Swiss-system pairing of one round. Players are ranked by score (then by rating)
+and paired top half against bottom half inside each score group, moving
+players down to the next group when their group cannot be paired. Nobody meets
+the same opponent twice, and with an odd field the lowest ranked player who
+has not had a bye yet sits out.
+
+The pairing is a depth-first search over the ranked field. Each position of
+the search is the set of players still unpaired, kept as a bitmask; positions
+already proven impossible are remembered, so a dead end is never explored
+twice. This keeps large fields (hundreds of players) fast even in late rounds,
+when many pairs are already excluded.
+"""
+
+RESULTS = {
+    '1-0': (1.0, 0.0),
+    '0-1': (0.0, 1.0),
+    '1/2-1/2': (0.5, 0.5),
+}
+BYE_POINTS = 1.0
+
+
+class PairingError(Exception):
+    pass
+
+
+def rank_players(players, scores, ratings=None):
+    ratings = ratings or {}
+    return sorted(players, key=lambda player: (-scores.get(player, 0), -ratings.get(player, 0), player))
+
+
+def _candidates(order, remaining, first, scores):
+    """Opponents for first, the best ranked unpaired player, in order of preference."""
+    rest = [index for index in range(first + 1, len(order)) if remaining >> index & 1]
+    score = scores[first]
+    group = [index for index in rest if scores[index] == score]
+    lower = rest[len(group):]
+    # Dutch system: the top of a score group meets the top of its bottom half
+    half = (len(group) + 1) // 2 - 1 if group else 0
+    return group[half:] + group[:half] + lower
+
+
+def pair_round(players, scores, opponents, colors=None, byes=(), ratings=None):
+    """
+    Pairs one round.
+    scores maps player to points so far, opponents maps player to the set of
+    players already met, colors maps player to games with white minus games
+    with black, byes holds the players that already sat out and ratings breaks
+    ties between equal scores.
+    Returns ([(white, black), ...], bye), bye being None with an even field.
+    Raises PairingError when every pairing would repeat a game.
+    """
+    colors = colors or {}
+    order = rank_players(players, scores, ratings)
+    ranked_scores = [scores.get(player, 0) for player in order]
+    met = [
+        {position for position, other in enumerate(order) if other in opponents.get(player, ())}
+        for player in order
+    ]
+    failed = set()
+
+    def position(remaining):
+        # The best ranked unpaired player and the opponents still to try for them
+        first = (remaining & -remaining).bit_length() - 1
+        rest = remaining & ~(1 << first)
+        candidates = (
+            opponent for opponent in _candidates(order, rest, first, ranked_scores) if opponent not in met[first]
+        )
+        return remaining, first, rest, candidates
+
+    def search(remaining):
+        """
+        Pairs of positions pairing everyone in remaining, best ranked boards first,
+        or None. The search keeps its own stack, one entry per board being tried,
+        instead of recursing, so the field size is not bound by the recursion limit.
+        """
+        if not remaining:
+            return []
+        if remaining in failed:
+            return None
+        stack = [position(remaining)]
+        # pairs[i] is the board tried at stack[i]
+        pairs = []
+        while stack:
+            remaining, first, rest, candidates = stack[-1]
+            if len(pairs) == len(stack):
+                pairs.pop()
+            opponent = next(candidates, None)
+            if opponent is None:
+                failed.add(remaining)
+                stack.pop()
+                continue
+            pairs.append((first, opponent))
+            unpaired = rest & ~(1 << opponent)
+            if not unpaired:
+                return pairs
+            if unpaired not in failed:
+                stack.append(position(unpaired))
+        return None
+
+    everyone = (1 << len(order)) - 1
+    if len(order) % 2:
+        bye_candidates = [index for index in reversed(range(len(order))) if order[index] not in byes]
+        # Everyone has had a bye: start over from the bottom
+        bye_candidates = bye_candidates or list(reversed(range(len(order))))
+    else:
+        bye_candidates = [None]
+
+    for bye in bye_candidates:
+        pairs = search(everyone if bye is None else everyone & ~(1 << bye))
+        if pairs is not None:
+            break
+    else:
+        raise PairingError('No pairing avoids a rematch.')
+
+    boards = []
+    for higher, lower in pairs:
+        white, black = order[higher], order[lower]
+        # Whoever had white less often gets it; the higher ranked player on a tie
+        if colors.get(black, 0) < colors.get(white, 0):
+            white, black = black, white
+        boards.append((white, black))
+    return boards, None if bye is None else order[bye]
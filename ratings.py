@@ -0,0 +1,40 @@
+# ratings.py
+"""
+Elo-style rating updates derived from tournament standings. Inside each
+category every pair of players is scored as a virtual game won by whoever
+finished with more points (a draw on equal points), and the usual Elo update
+is averaged over those games, so a whole tournament moves a rating by at most
+k points whatever the number of entrants.
+"""
+
+INITIAL_RATING = 1500
+K_FACTOR = 32
+
+
+def expected_score(rating, opponent_rating):
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def rate_category(ratings, results, k=K_FACTOR, initial=INITIAL_RATING):
+    """
+    New ratings of the players of one category of one tournament.
+    ratings maps player_id to the rating before the tournament (players missing
+    from it start at initial); results is a list of (player_id, points).
+    Returns {player_id: (rating_before, rating_after)}.
+    """
+    before = {player_id: ratings.get(player_id, initial) for player_id, _ in results}
+    if len(results) < 2:
+        return {player_id: (rating, rating) for player_id, rating in before.items()}
+
+    games = len(results) - 1
+    updates = {}
+    for player_id, points in results:
+        rating = before[player_id]
+        change = 0.0
+        for opponent_id, opponent_points in results:
+            if opponent_id == player_id:
+                continue
+            score = 1.0 if points > opponent_points else 0.5 if points == opponent_points else 0.0
+            change += score - expected_score(rating, before[opponent_id])
+        updates[player_id] = (rating, rating + k * change / games)
+    return updates
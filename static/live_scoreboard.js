@@ -0,0 +1,104 @@
+// Live scoreboard: tables marked with data-live-standings or data-live-results are
+// patched in place from the /events/scoreboard stream when scores change, instead
+// of the page being reloaded. Standings rows carry data-player-id and data-total;
+// result tables carry data-tournament-id and data-category, their rows
+// data-point-id and data-points.
+document.addEventListener('DOMContentLoaded', function () {
+    const source = document.querySelector('[data-live-url]');
+    if (!source || !window.EventSource) {
+        return;
+    }
+
+    function cell(text) {
+        const td = document.createElement('td');
+        td.textContent = text;
+        return td;
+    }
+
+    function highlight(row) {
+        row.classList.add('table-success');
+        setTimeout(function () { row.classList.remove('table-success'); }, 2000);
+    }
+
+    function sortRows(tbody, compare) {
+        Array.from(tbody.querySelectorAll('tr[data-sort]')).sort(compare).forEach(function (row) {
+            tbody.appendChild(row);
+        });
+    }
+
+    function patchStandings(standings) {
+        document.querySelectorAll('[data-live-standings] tbody').forEach(function (tbody) {
+            standings.forEach(function (standing) {
+                let row = tbody.querySelector(`tr[data-player-id="${standing.player_id}"]`);
+                if (!row) {
+                    row = document.createElement('tr');
+                    row.dataset.sort = '';
+                    row.dataset.playerId = standing.player_id;
+                    tbody.appendChild(row);
+                    const empty = tbody.querySelector('tr[data-empty]');
+                    if (empty) {
+                        empty.remove();
+                    }
+                }
+                row.dataset.total = standing.total_points;
+                row.replaceChildren(cell(''), cell(standing.first_name), cell(standing.last_name),
+                    cell(standing.total_points));
+                highlight(row);
+            });
+            // Same order as the server: total points, then player id, both descending
+            sortRows(tbody, function (a, b) {
+                return (b.dataset.total - a.dataset.total) || (b.dataset.playerId - a.dataset.playerId);
+            });
+            tbody.querySelectorAll('tr[data-sort]').forEach(function (row, index) {
+                row.cells[0].textContent = index + 1;
+            });
+        });
+    }
+
+    function patchResults(results) {
+        document.querySelectorAll('[data-live-results]').forEach(function (container) {
+            results.forEach(function (result) {
+                if (String(result.tournament_id) !== container.dataset.tournamentId) {
+                    return;
+                }
+                const table = container.querySelector(`table[data-category="${result.category}"]`);
+                const previous = container.querySelector(`tr[data-point-id="${result.point_id}"]`);
+                if (previous) {
+                    previous.remove();
+                }
+                const row = document.createElement('tr');
+                row.dataset.sort = '';
+                row.dataset.pointId = result.point_id;
+                row.dataset.points = result.points;
+                row.append(cell(result.first_name), cell(result.last_name), cell(result.points));
+                table.querySelector('tbody').appendChild(row);
+                highlight(row);
+            });
+            container.querySelectorAll('table[data-category]').forEach(function (table) {
+                const tbody = table.querySelector('tbody');
+                sortRows(tbody, function (a, b) { return b.dataset.points - a.dataset.points; });
+                const empty = !tbody.querySelector('tr[data-sort]');
+                table.hidden = empty;
+                container.querySelector(`[data-empty="${table.dataset.category}"]`).hidden = !empty;
+            });
+        });
+    }
+
+    function connect() {
+        const events = new EventSource(source.dataset.liveUrl);
+        events.addEventListener('scoreboard', function (event) {
+            const payload = JSON.parse(event.data);
+            patchStandings(payload.standings);
+            patchResults(payload.results);
+        });
+        events.addEventListener('error', function () {
+            // The browser retries dropped connections itself, but not refused ones
+            // (e.g. an error status); try again a little later
+            if (events.readyState === EventSource.CLOSED) {
+                setTimeout(connect, 30000);
+            }
+        });
+    }
+
+    connect();
+});
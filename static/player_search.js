@@ -0,0 +1,102 @@
+// Player autocomplete: an input with data-player-search looks players up in
+// /api/v1/players as the user types, instead of the page listing every player.
+// data-name is the form field that receives the chosen id. With data-multiple
+// every choice is added as a removable badge carrying its own hidden input,
+// otherwise the single hidden input inside data-selection is replaced.
+document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('input[data-player-search]').forEach(function (input) {
+        const url = input.dataset.url;
+        const name = input.dataset.name;
+        const multiple = input.hasAttribute('data-multiple');
+        const selection = document.getElementById(input.dataset.selection);
+        const list = document.createElement('div');
+        list.className = 'list-group position-absolute w-100 shadow-sm';
+        list.style.zIndex = 1000;
+        input.parentNode.style.position = 'relative';
+        input.parentNode.appendChild(list);
+
+        let timer = null;
+        let latest = 0;
+
+        function choose(player) {
+            const label = `${player.first_name} ${player.last_name}`;
+            if (multiple) {
+                if (selection.querySelector(`input[value="${player.id}"]`)) {
+                    return;
+                }
+                const badge = document.createElement('span');
+                badge.className = 'badge bg-primary me-2 mb-2';
+                badge.textContent = label + ' ';
+                const remove = document.createElement('button');
+                remove.type = 'button';
+                remove.className = 'btn-close btn-close-white ms-1';
+                remove.setAttribute('aria-label', 'Remove');
+                remove.addEventListener('click', function () { badge.remove(); });
+                const hidden = document.createElement('input');
+                hidden.type = 'hidden';
+                hidden.name = name;
+                hidden.value = player.id;
+                badge.append(remove, hidden);
+                selection.appendChild(badge);
+                input.value = '';
+            } else {
+                selection.innerHTML = '';
+                const hidden = document.createElement('input');
+                hidden.type = 'hidden';
+                hidden.name = name;
+                hidden.value = player.id;
+                selection.appendChild(hidden);
+                input.value = label;
+            }
+            list.innerHTML = '';
+        }
+
+        function show(players) {
+            list.innerHTML = '';
+            players.forEach(function (player) {
+                const item = document.createElement('button');
+                item.type = 'button';
+                item.className = 'list-group-item list-group-item-action';
+                item.textContent = `${player.first_name} ${player.last_name}`;
+                item.addEventListener('click', function () { choose(player); });
+                list.appendChild(item);
+            });
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            const term = input.value.trim();
+            if (!multiple) {
+                selection.innerHTML = '';
+            }
+            if (!term) {
+                list.innerHTML = '';
+                return;
+            }
+            timer = setTimeout(function () {
+                const request = ++latest;
+                fetch(`${url}?q=${encodeURIComponent(term)}`, { credentials: 'same-origin' })
+                    .then(function (response) { return response.json(); })
+                    .then(function (body) {
+                        // Answers can arrive out of order; only the newest is shown
+                        if (request === latest) {
+                            show(body.data || []);
+                        }
+                    });
+            }, 150);
+        });
+
+        input.addEventListener('keydown', function (event) {
+            if (event.key === 'Enter' && list.firstChild) {
+                event.preventDefault();
+                list.firstChild.click();
+            }
+        });
+
+        document.addEventListener('click', function (event) {
+            if (event.target !== input && !list.contains(event.target)) {
+                list.innerHTML = '';
+            }
+        });
+    });
+});
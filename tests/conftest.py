@@ -0,0 +1,141 @@
+# tests/conftest.py
+import datetime
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as masnou  # noqa: E402
+
+# The PostgreSQL runs need a database that the tests may empty, e.g.
+#   createdb masnou_test && TEST_POSTGRES_URL=postgresql://localhost/masnou_test python -m pytest
+# They are skipped when it cannot be reached.
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL', 'postgresql://localhost/masnou_test')
+
+PLAYERS = [
+    ('Anna', 'Puig'), ('Bernat', 'Soler'), ('Carla', 'Vidal'), ('David', 'Roca'),
+    ('Elena', 'Serra'), ('Ferran', 'Mas'), ('Gemma', 'Font'), ('Hugo', 'Pons'),
+]
+TOURNAMENTS = [datetime.date(2023, 11, 4), datetime.date(2024, 1, 13), datetime.date(2024, 2, 10)]
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'sqlite_only: the test needs SQLite (e.g. EXPLAIN QUERY PLAN)')
+
+
+def empty_postgres_database(url):
+    """Drops every table of the PostgreSQL test database, or skips the test when it is unreachable."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import OperationalError
+    try:
+        engine = create_engine(url)
+        connection = engine.connect()
+    except (ImportError, OperationalError) as e:
+        pytest.skip(f'PostgreSQL is not available at {url}: {e}')
+    with connection.begin():
+        connection.exec_driver_sql('DROP SCHEMA public CASCADE')
+        connection.exec_driver_sql('CREATE SCHEMA public')
+    connection.close()
+    engine.dispose()
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def database_url(request, tmp_path):
+    """The DATABASE_URL the app under test uses: a fresh SQLite file, then the PostgreSQL test database."""
+    if request.param == 'sqlite':
+        return f"sqlite:///{tmp_path / 'test.db'}"
+    if request.node.get_closest_marker('sqlite_only'):
+        pytest.skip('SQLite only')
+    empty_postgres_database(POSTGRES_URL)
+    return POSTGRES_URL
+
+
+@pytest.fixture
+def app(database_url, tmp_path, monkeypatch):
+    """An app on an empty, migrated database, with its instance folder in tmp_path."""
+    monkeypatch.setenv('INSTANCE_PATH', str(tmp_path / 'instance'))
+    app = masnou.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'WTF_CSRF_ENABLED': False,
+        # Every request runs its queries instead of reading the cache
+        'CACHE_BACKEND': 'none',
+        'USER_CACHE_SECONDS': 0,
+        'MIGRATION_PAUSE_SECONDS': 0,
+    })
+    with app.app_context():
+        masnou.run_migrations(log=lambda message: None)
+    yield app
+    with app.app_context():
+        masnou.db.session.remove()
+        masnou.db.engine.dispose()
+
+
+@pytest.fixture
+def seeded(app):
+    """Fills the database with a few tournaments, players and results, and its derived tables."""
+    with app.app_context():
+        session = masnou.db.session
+        session.add(masnou.User(username='admin', password='unused'))
+        players = [masnou.Player(first_name=first, last_name=last) for first, last in PLAYERS]
+        tournaments = [masnou.Tournament(date=date) for date in TOURNAMENTS]
+        session.add_all(players + tournaments)
+        session.flush()
+        for number, tournament in enumerate(tournaments):
+            for position, player in enumerate(players[number:] + players[:number]):
+                session.add(masnou.Point(
+                    tournament_id=tournament.id,
+                    player_id=player.id,
+                    points=float(len(players) - position) / 2,
+                    category='A' if position % 2 == 0 else 'B',
+                ))
+        session.flush()
+        masnou.refresh_derived_data()
+        masnou.index_players()
+        session.commit()
+    return app
+
+
+DERIVED_TABLES = ['Standing', 'YearStanding', 'PlayerTimeline', 'RatingHistory', 'RatingCheckpoint']
+
+
+def derived_rows():
+    """Every row of the tables derived from Point, by model name, floats rounded against summation order."""
+    # Table selects do not autoflush
+    masnou.db.session.flush()
+    rows = {}
+    for name in DERIVED_TABLES:
+        table = getattr(masnou, name).__table__
+        rows[name] = sorted(
+            tuple(round(value, 9) if isinstance(value, float) else value for value in row)
+            for row in masnou.db.session.execute(masnou.db.select(table))
+        )
+    return rows
+
+
+def rebuilt_rows():
+    """derived_rows() after emptying the derived tables and rebuilding them from Point; rolls back."""
+    session = masnou.db.session
+    for name in DERIVED_TABLES:
+        # Through the ORM, so the session forgets the loaded rating checkpoint too
+        getattr(masnou, name).query.delete()
+    masnou.refresh_derived_data()
+    rows = derived_rows()
+    session.rollback()
+    return rows
+
+
+def logged_in_client(app):
+    """A test client logged in as the seeded user."""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+        session['_fresh'] = True
+    return client
+
+
+@pytest.fixture
+def client(seeded):
+    return logged_in_client(seeded)
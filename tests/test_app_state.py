@@ -0,0 +1,34 @@
+# tests/test_app_state.py
+"""
+Caches, counters and metrics live in app.extensions, so apps built in the same
+process (tests, a CLI next to a server) never share them.
+"""
+from conftest import logged_in_client
+
+import app as masnou
+
+
+def test_apps_in_one_process_keep_their_own_state(seeded, tmp_path, monkeypatch):
+    monkeypatch.setenv('INSTANCE_PATH', str(tmp_path / 'other-instance'))
+    other = masnou.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': seeded.config['SQLALCHEMY_DATABASE_URI'],
+        'METRICS_ENABLED': True,
+        'METRICS_TOKEN': 'secret',
+    })
+    try:
+        assert logged_in_client(other).get('/api/v1/rankings').status_code == 200
+        assert other.extensions['cache_misses'] and len(other.extensions['user_cache']._entries) == 1
+        metrics_text = other.test_client().get('/metrics', headers={'Authorization': 'Bearer secret'})\
+            .get_data(as_text=True)
+        assert 'endpoint="main.api_rankings"' in metrics_text
+
+        # The seeded app served nothing and enabled no metrics
+        assert not seeded.extensions['cache_misses']
+        assert not seeded.extensions['user_cache']._entries
+        assert 'metrics' not in seeded.extensions
+        assert logged_in_client(seeded).get('/metrics').status_code == 404
+    finally:
+        with other.app_context():
+            masnou.db.session.remove()
+            masnou.db.engine.dispose()
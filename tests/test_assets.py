@@ -0,0 +1,39 @@
+# tests/test_assets.py
+"""
+`flask build-assets` fingerprints the static files; pages link the hashed copies
+from the manifest each app holds in app.extensions, and their ETags follow it.
+"""
+import os
+import shutil
+
+
+def build_assets(app, tmp_path):
+    # A copy of static/, so the build does not write into the checkout
+    app.static_folder = str(tmp_path / 'static')
+    shutil.copytree(os.path.join(app.root_path, 'static'), app.static_folder, ignore=shutil.ignore_patterns('dist'))
+    result = app.test_cli_runner().invoke(args=['build-assets', '--offline'])
+    assert result.exit_code == 0, result.output
+
+
+def test_pages_link_the_assets_built_by_the_command(app, tmp_path):
+    build_assets(app, tmp_path)
+
+    client = app.test_client()
+    hashed = app.extensions['asset_manifest']['images/fav.png']
+    assert f'href="/assets/{hashed}"' in client.get('/login').get_data(as_text=True)
+    response = client.get(f'/assets/{hashed}')
+    assert response.status_code == 200
+    assert response.cache_control.immutable
+
+
+def test_page_etags_change_with_the_assets(client, seeded, tmp_path):
+    first = client.get('/')
+    assert client.get('/', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    build_assets(seeded, tmp_path)
+
+    # Same data, but the cached page links the assets of the previous build
+    second = client.get('/', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert seeded.extensions['asset_manifest']['images/logo.png'] in second.get_data(as_text=True)
@@ -0,0 +1,69 @@
+# tests/test_concurrent_writes.py
+"""
+Score changes arriving at once from several threads, as from gunicorn's threads
+and workers: every change must land in the standings and move the data version.
+"""
+import datetime
+import threading
+
+from conftest import logged_in_client
+
+import app as masnou
+
+WRITERS = 6
+WRITES = 4
+
+
+def test_concurrent_score_changes(seeded):
+    with seeded.app_context():
+        session = masnou.db.session
+        first_date = datetime.date(2025, 1, 4)
+        tournaments = [
+            masnou.Tournament(date=first_date + datetime.timedelta(days=7 * number))
+            for number in range(WRITERS * WRITES)
+        ]
+        session.add_all(tournaments)
+        session.commit()
+        tournament_ids = [tournament.id for tournament in tournaments]
+        before = session.get(masnou.Standing, 1)
+        total_before, played_before = before.total_points, before.tournaments_played
+        version_before = masnou.data_version()
+        session.remove()
+
+    barrier = threading.Barrier(WRITERS)
+    failures = []
+    versions = []
+
+    def writer(number):
+        client = logged_in_client(seeded)
+        barrier.wait()
+        # Every writer scores the same player, so each refresh recomputes the same standing rows
+        for tournament_id in tournament_ids[number * WRITES:(number + 1) * WRITES]:
+            response = client.post('/add_points', data={
+                'tournament': tournament_id,
+                'player': 1,
+                'points': '1.5',
+                'category': 'A',
+            })
+            if response.status_code != 302:
+                failures.append((tournament_id, response.status_code))
+            with seeded.app_context():
+                versions.append(masnou.data_version())
+
+    threads = [threading.Thread(target=writer, args=(number,)) for number in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not failures
+    assert version_before not in versions
+    with seeded.app_context():
+        session = masnou.db.session
+        standing = session.get(masnou.Standing, 1)
+        assert standing.total_points == total_before + 1.5 * WRITERS * WRITES
+        assert standing.tournaments_played == played_before + WRITERS * WRITES
+        year_standing = session.get(masnou.YearStanding, (1, 2025))
+        assert year_standing.total_points == 1.5 * WRITERS * WRITES
+        assert session.query(masnou.PlayerTimeline).filter_by(player_id=1).count() == played_before + WRITERS * WRITES
+        assert masnou.data_version() != version_before
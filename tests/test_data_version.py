@@ -0,0 +1,66 @@
+# tests/test_data_version.py
+"""
+The data version behind the caches and ETags. On PostgreSQL, app hosts share
+no instance folder, so a change made through one must reach the others.
+"""
+import datetime
+
+import pytest
+from conftest import logged_in_client
+
+import app as masnou
+
+
+@pytest.fixture
+def other_host(seeded, tmp_path, monkeypatch):
+    """A second app on the same database with an instance folder of its own, as on another host."""
+    with seeded.app_context():
+        if masnou.uses_version_file():
+            pytest.skip('SQLite keeps the data version in the instance folder of its one host')
+    monkeypatch.setenv('INSTANCE_PATH', str(tmp_path / 'other-instance'))
+    app = masnou.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': seeded.config['SQLALCHEMY_DATABASE_URI'],
+        'WTF_CSRF_ENABLED': False,
+        'CACHE_BACKEND': 'memory',
+        'USER_CACHE_SECONDS': 60,
+    })
+    yield app
+    with app.app_context():
+        masnou.db.session.remove()
+        masnou.db.engine.dispose()
+
+
+def test_a_change_on_one_host_reaches_the_others(client, seeded, other_host):
+    with seeded.app_context():
+        tournament = masnou.Tournament(date=datetime.date(2025, 3, 1))
+        masnou.db.session.add(tournament)
+        masnou.db.session.commit()
+        tournament_id = tournament.id
+    other = logged_in_client(other_host)
+    first = other.get('/api/v1/rankings')
+    assert first.status_code == 200
+    assert other.get('/api/v1/rankings', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    response = client.post('/add_points', data={
+        'tournament': tournament_id, 'player': 1, 'points': '7.5', 'category': 'A'
+    })
+    assert response.status_code == 302
+
+    # Neither the cached ranking nor the old ETag of the other host survive the change
+    second = other.get('/api/v1/rankings', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    totals = {row['player_id']: row['total_points'] for row in second.get_json()['data']}
+    assert totals[1] == {row['player_id']: row['total_points'] for row in first.get_json()['data']}[1] + 7.5
+
+
+def test_a_commit_reads_its_own_version(seeded):
+    with seeded.app_context():
+        before = masnou.data_version()
+        masnou.db.session.add(masnou.Player(first_name='Nora', last_name='Nova'))
+        masnou.db.session.commit()
+        after = masnou.data_version()
+        assert after != before
+    with seeded.app_context():
+        assert masnou.data_version() == after
@@ -0,0 +1,89 @@
+# tests/test_exports.py
+"""
+Exports written by the background export threads and streamed from their spool
+files while they grow.
+"""
+import gzip
+import os
+import sqlite3
+
+import pytest
+from conftest import PLAYERS, TOURNAMENTS, logged_in_client
+
+import app as masnou
+
+
+def test_follow_export_restarts_a_removed_spool_file(app):
+    """A spool file removed after start_export found it complete is written again."""
+    with app.test_request_context():
+        path = masnou.export_spool_path('removed.csv')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as spool:
+            spool.write(b'old')
+        stream = masnou.follow_export(path, lambda: iter([b'new ', b'content']))
+        os.remove(path)
+        assert b''.join(stream) == b'new content'
+        assert os.path.exists(path)
+
+
+def test_follow_export_raises_the_producer_error(app):
+    def produce():
+        raise ValueError('broken export')
+        yield b''
+
+    with app.test_request_context():
+        stream = masnou.follow_export(masnou.export_spool_path('broken.csv'), produce)
+        with pytest.raises(ValueError, match='broken export'):
+            b''.join(stream)
+
+
+@pytest.mark.sqlite_only
+@pytest.mark.parametrize('accept_encoding', ['identity', 'gzip'])
+def test_export_db_streams_a_snapshot(client, tmp_path, accept_encoding):
+    response = client.get('/export-db', headers={'Accept-Encoding': accept_encoding})
+    assert response.status_code == 200
+    content = response.get_data()
+    if accept_encoding == 'gzip':
+        assert response.headers['Content-Encoding'] == 'gzip'
+        content = gzip.decompress(content)
+    path = tmp_path / 'downloaded.db'
+    path.write_bytes(content)
+    connection = sqlite3.connect(path)
+    try:
+        assert connection.execute('SELECT COUNT(*) FROM player').fetchone() == (len(PLAYERS),)
+    finally:
+        connection.close()
+
+    again = client.get('/export-db', headers={'Accept-Encoding': accept_encoding, 'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+    assert again.get_data() == b''
+
+
+@pytest.mark.sqlite_only
+def test_apps_sharing_an_instance_folder_keep_their_exports_apart(client, tmp_path):
+    """Another database with the same instance folder, e.g. after copy-db and a DATABASE_URL switch."""
+    other = masnou.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'other.db'}",
+        'CACHE_BACKEND': 'none',
+        'USER_CACHE_SECONDS': 0,
+    })
+    with other.app_context():
+        masnou.run_migrations(log=lambda message: None)
+        session = masnou.db.session
+        session.add(masnou.User(username='admin', password='unused'))
+        player = masnou.Player(first_name='Zoe', last_name='Other')
+        tournament = masnou.Tournament(date=TOURNAMENTS[0])
+        session.add_all([player, tournament])
+        session.flush()
+        session.add(masnou.Point(tournament_id=tournament.id, player_id=player.id, points=1.0, category='A'))
+        session.commit()
+
+    # Both apps now read the same data version from the shared instance folder
+    exported = client.get('/export', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True)
+    other_exported = logged_in_client(other).get('/export', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True)
+    assert 'Zoe' not in exported and PLAYERS[0][0] in exported
+    assert 'Zoe' in other_exported and PLAYERS[0][0] not in other_exported
+    with other.app_context():
+        masnou.db.session.remove()
+        masnou.db.engine.dispose()
@@ -0,0 +1,115 @@
+# tests/test_import_results.py
+"""
+import_tournament_results: one report entry per sheet row, all accepted rows
+committed together (or none), and one refresh of the derived tables per import.
+"""
+import datetime
+
+import pytest
+from conftest import derived_rows, rebuilt_rows
+
+import app as masnou
+
+NEW_DATE = datetime.date(2024, 3, 9)
+
+
+@pytest.fixture
+def tournament_id(seeded):
+    """An empty tournament after the seeded ones."""
+    with seeded.app_context():
+        tournament = masnou.Tournament(date=NEW_DATE)
+        masnou.db.session.add(tournament)
+        masnou.db.session.commit()
+        return tournament.id
+
+
+def import_json(client, tournament_id, results, create_missing=False):
+    response = client.post('/import_results', json={
+        'tournament_id': tournament_id, 'create_missing': create_missing, 'results': results,
+    })
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def row(first_name, last_name, points, category='A'):
+    return {'first_name': first_name, 'last_name': last_name, 'points': points, 'category': category}
+
+
+def test_report_has_one_entry_per_row(client, seeded, tournament_id):
+    report = import_json(client, tournament_id, [
+        row('Anna', 'Puig', '3.5'),
+        row('Zoe', 'Nova', '2'),
+        row(' anna ', 'PUIG', '1', 'B'),
+        row('Bernat', 'Soler', 'abc'),
+        row('Carla', 'Vidal', '1.25'),
+        row('David', 'Roca', '-1'),
+        row('', 'Serra', '1'),
+        row('Ferran', 'Mas', '1', 'C'),
+    ])
+    assert (report['added'], report['errors']) == (1, 7)
+    assert [(entry['row'], entry['status'], entry.get('message')) for entry in report['rows']] == [
+        (1, 'added', None),
+        (2, 'error', 'Unknown player.'),
+        (3, 'error', 'Player appears more than once in the sheet.'),
+        (4, 'error', 'Invalid number. Please enter a numeric value.'),
+        (5, 'error', 'Points must be in 0.5 increments (e.g., 0.5, 1.0, 1.5).'),
+        (6, 'error', 'Points must be 0 or greater.'),
+        (7, 'error', 'First and last name are required.'),
+        (8, 'error', 'Category must be A or B.'),
+    ]
+    assert report['rows'][0]['player_id'] == 1
+    with seeded.app_context():
+        assert [(point.player_id, point.points) for point in
+                masnou.Point.query.filter_by(tournament_id=tournament_id)] == [(1, 3.5)]
+
+
+def test_missing_players_are_created_and_taken_places_reported(client, seeded):
+    report = import_json(client, 1, [row('Zoe', 'Nova', '2', 'B'), row('Anna', 'Puig', '1')], create_missing=True)
+    assert [(entry['status'], entry.get('message')) for entry in report['rows']] == [
+        ('created', None),
+        ('error', 'Player already has points in this tournament.'),
+    ]
+    with seeded.app_context():
+        player = masnou.db.session.get(masnou.Player, report['rows'][0]['player_id'])
+        assert (player.first_name, player.last_name) == ('Zoe', 'Nova')
+        assert [row.id for row in masnou.search_players('zoe nova')] == [player.id]
+
+
+def test_a_conflicting_row_rolls_back_the_whole_import(client, seeded, monkeypatch):
+    # As if Anna's points in tournament 1 were added after the sheet was checked
+    monkeypatch.setattr(masnou, 'tournament_player_ids', lambda tournament_id: [])
+    with seeded.app_context():
+        before = derived_rows()
+        points = masnou.Point.query.count()
+
+    report = import_json(client, 1, [row('Zoe', 'Nova', '2'), row('Anna', 'Puig', '1')], create_missing=True)
+
+    assert report['added'] == 0
+    assert {entry['message'] for entry in report['rows']} == {
+        'The import was rolled back because the data changed meanwhile. Please retry.'
+    }
+    with seeded.app_context():
+        assert masnou.Player.query.filter_by(first_name='Zoe').count() == 0
+        assert masnou.Point.query.count() == points
+        assert derived_rows() == before
+
+
+def test_derived_tables_are_refreshed_once(client, seeded, tournament_id, monkeypatch):
+    calls = []
+    refresh_derived_data = masnou.refresh_derived_data
+
+    def counted(player_ids=None, since=None):
+        player_ids = set(player_ids)
+        calls.append((player_ids, since))
+        refresh_derived_data(player_ids, since)
+
+    monkeypatch.setattr(masnou, 'refresh_derived_data', counted)
+    report = import_json(client, tournament_id, [
+        row('Anna', 'Puig', '3'), row('Bernat', 'Soler', '2.5', 'B'), row('Zoe', 'Nova', '1'),
+    ], create_missing=True)
+
+    assert report['added'] == 3
+    assert calls == [({1, 2, report['rows'][2]['player_id']}, NEW_DATE)]
+    monkeypatch.undo()
+    with seeded.app_context():
+        assert derived_rows() == rebuilt_rows()
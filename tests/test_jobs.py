@@ -0,0 +1,87 @@
+# tests/test_jobs.py
+"""
+Background jobs: a `run-jobs` worker may run in a container of its own, so the
+files it produces live in the database and any web host can serve them.
+"""
+import datetime
+import sqlite3
+
+import pytest
+from conftest import PLAYERS, TOURNAMENTS, logged_in_client
+
+import app as masnou
+
+
+@pytest.fixture
+def web_host(seeded, tmp_path, monkeypatch):
+    """Another app on the same database, with an instance folder the worker never sees."""
+    monkeypatch.setenv('INSTANCE_PATH', str(tmp_path / 'web-instance'))
+    app = masnou.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': seeded.config['SQLALCHEMY_DATABASE_URI'],
+        'CACHE_BACKEND': 'none',
+        'USER_CACHE_SECONDS': 0,
+    })
+    yield app
+    with app.app_context():
+        masnou.db.session.remove()
+        masnou.db.engine.dispose()
+
+
+def run_queued_jobs(app):
+    with app.app_context():
+        masnou.job_worker(burst=True)
+
+
+def test_export_job_is_served_by_another_host(client, seeded, web_host, monkeypatch):
+    # Several pieces even for the small seeded export
+    monkeypatch.setattr(masnou, 'JOB_FILE_CHUNK_SIZE', 100)
+    assert client.post('/jobs', data={'kind': 'export_csv'}).status_code == 302
+    run_queued_jobs(seeded)
+
+    with seeded.app_context():
+        job = masnou.Job.query.one()
+        assert job.status == 'done'
+        assert masnou.db.session.query(masnou.JobFileChunk).filter_by(job_id=job.id).count() > 1
+        expected = b''.join(masnou.generate_csv(masnou.DATABASE_EXPORT_HEADER, masnou.database_export_query()))
+
+    response = logged_in_client(web_host).get(f'/jobs/{job.id}/download')
+    assert response.status_code == 200
+    assert response.headers['Content-Length'] == str(len(expected))
+    assert response.get_data() == expected
+    assert response.get_data(as_text=True).count('\n') == 1 + len(PLAYERS) * len(TOURNAMENTS)
+
+
+def test_an_unchanged_export_reuses_the_done_job(client, seeded):
+    client.post('/jobs', data={'kind': 'export_csv'})
+    run_queued_jobs(seeded)
+    client.post('/jobs', data={'kind': 'export_csv'})
+    with seeded.app_context():
+        assert [job.status for job in masnou.Job.query] == ['done']
+
+
+@pytest.mark.sqlite_only
+def test_snapshot_job_stores_the_database(client, seeded, web_host, tmp_path):
+    client.post('/jobs', data={'kind': 'snapshot_db'})
+    run_queued_jobs(seeded)
+    with seeded.app_context():
+        job = masnou.Job.query.one()
+    path = tmp_path / 'downloaded.db'
+    path.write_bytes(logged_in_client(web_host).get(f'/jobs/{job.id}/download').get_data())
+    connection = sqlite3.connect(path)
+    try:
+        assert connection.execute('SELECT COUNT(*) FROM point').fetchone() == (len(PLAYERS) * len(TOURNAMENTS),)
+    finally:
+        connection.close()
+
+
+def test_old_jobs_are_deleted_with_their_files(client, seeded):
+    client.post('/jobs', data={'kind': 'export_csv'})
+    run_queued_jobs(seeded)
+    with seeded.app_context():
+        job_id = masnou.Job.query.one().id
+        masnou.update_job(job_id, finished_at=masnou.utcnow() - datetime.timedelta(days=2))
+        masnou.delete_old_jobs()
+        assert masnou.db.session.get(masnou.Job, job_id) is None
+        assert masnou.db.session.query(masnou.JobFileChunk).count() == 0
+    assert client.get(f'/jobs/{job_id}/download').status_code == 404
@@ -0,0 +1,34 @@
+# tests/test_live_scoreboard.py
+"""
+Viewers over a worker's LIVE_MAX_CLIENTS streams poll /events/scoreboard: each
+response holds the events they missed and tells the browser when to ask again.
+"""
+import pytest
+
+
+@pytest.fixture
+def event_log(seeded):
+    broadcaster = seeded.extensions['live_updates']
+    # Every stream slot taken
+    broadcaster.max_clients = 0
+    return broadcaster.event_log
+
+
+def test_first_poll_starts_from_the_latest_event(client, event_log):
+    event_log.append('scoreboard', {'standings': [], 'results': []})
+    response = client.get('/events/scoreboard')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.get_data(as_text=True) == 'retry: 10000\n\nid: 1\n\n'
+
+
+def test_polls_return_the_missed_events(client, event_log):
+    for number in range(3):
+        event_log.append('scoreboard', {'standings': [], 'results': [number]})
+    body = client.get('/events/scoreboard', headers={'Last-Event-ID': '1'}).get_data(as_text=True)
+    assert body.startswith('retry: 10000\n\n')
+    assert [line for line in body.splitlines() if line.startswith('id: ')] == ['id: 2', 'id: 3']
+    assert 'data: {"standings": [], "results": [2]}' in body
+
+    assert client.get('/events/scoreboard', headers={'Last-Event-ID': '3'}).get_data(as_text=True) == \
+        'retry: 10000\n\n'
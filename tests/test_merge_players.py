@@ -0,0 +1,64 @@
+# tests/test_merge_players.py
+"""
+merge_players keeps one result per tournament and refreshes only the merged
+players' derived rows, which must match a full rebuild afterwards.
+"""
+import pytest
+from conftest import TOURNAMENTS, derived_rows, rebuilt_rows
+
+import app as masnou
+
+# Seeded scores of Anna Puig (1) and Bernat Soler (2): both played every tournament
+SURVIVOR, DUPLICATE = 1, 2
+
+
+def point(player_id, tournament_id):
+    return masnou.Point.query.filter_by(player_id=player_id, tournament_id=tournament_id).one_or_none()
+
+
+def test_merge_keeps_the_higher_score_and_the_survivor_on_a_tie(seeded):
+    with seeded.app_context():
+        # Tournament 3: both scored 1.0, the survivor in A and the duplicate in B
+        point(DUPLICATE, 3).points = 1.0
+        masnou.db.session.commit()
+
+        moved = masnou.merge_players(SURVIVOR, [DUPLICATE])
+        masnou.db.session.commit()
+
+        assert moved == 1
+        kept = {tournament_id: point(SURVIVOR, tournament_id) for tournament_id in range(1, len(TOURNAMENTS) + 1)}
+        # 4.0 against 3.5, the duplicate's 4.0 against 0.5, then the survivor's own row on the tie
+        assert {tournament_id: (row.points, row.category) for tournament_id, row in kept.items()} == {
+            1: (4.0, 'A'), 2: (4.0, 'A'), 3: (1.0, 'A'),
+        }
+        assert masnou.Point.query.filter_by(player_id=DUPLICATE).count() == 0
+        assert masnou.db.session.get(masnou.Player, DUPLICATE) is None
+
+
+def test_merge_leaves_the_derived_tables_as_a_rebuild_would(seeded):
+    with seeded.app_context():
+        masnou.merge_players(SURVIVOR, [DUPLICATE])
+        masnou.db.session.commit()
+
+        merged = derived_rows()
+        assert merged == rebuilt_rows()
+        standing = masnou.db.session.get(masnou.Standing, SURVIVOR)
+        assert (standing.total_points, standing.tournaments_played) == (9.0, 3)
+        assert masnou.db.session.get(masnou.Standing, DUPLICATE) is None
+        for name in ('PlayerTimeline', 'RatingHistory'):
+            player_ids = [row[0] for row in merged[name]]
+            assert player_ids.count(SURVIVOR) == len(TOURNAMENTS)
+            assert DUPLICATE not in player_ids
+
+
+@pytest.mark.parametrize('term', ['Bernat', 'Soler', 'bernat soler'])
+def test_merged_player_leaves_the_search(seeded, term):
+    with seeded.app_context():
+        assert [row.id for row in masnou.search_players(term)] == [DUPLICATE]
+        masnou.merge_players(SURVIVOR, [DUPLICATE])
+        masnou.db.session.commit()
+        assert masnou.search_players(term) == []
+        if masnou.db.engine.dialect.name == 'sqlite':
+            indexed = masnou.db.session.execute(masnou.text('SELECT rowid FROM player_search')).scalars()
+            assert DUPLICATE not in set(indexed)
+        assert [row.id for row in masnou.search_players('Anna Puig')] == [SURVIVOR]
@@ -0,0 +1,131 @@
+# tests/test_migrations.py
+"""
+Upgrading a database from before migrations existed: backfills run through the
+current refresh functions, so they must wait until the schema is up to date,
+and one that is interrupted must run again in full.
+"""
+import pytest
+from conftest import PLAYERS, TOURNAMENTS
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, Table, create_engine, func, insert, inspect, select
+
+import app as masnou
+import migrations
+
+
+def row_count(model):
+    return masnou.db.session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.fixture
+def legacy_app(database_url, tmp_path, monkeypatch):
+    """An app on a database with only the 0001 tables, holding points, and no migration recorded."""
+    monkeypatch.setenv('INSTANCE_PATH', str(tmp_path / 'instance'))
+    app = masnou.create_app({
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'MIGRATION_PAUSE_SECONDS': 0,
+        'MIGRATION_CHUNK_SIZE': 3,
+    })
+    with app.app_context():
+        initial = migrations.discover()[0].module
+        # Written without the session, whose commits need tables of later migrations
+        with masnou.db.engine.begin() as connection:
+            initial.metadata.create_all(connection)
+            connection.execute(insert(initial.player), [
+                {'id': player_id, 'first_name': first, 'last_name': last}
+                for player_id, (first, last) in enumerate(PLAYERS, start=1)
+            ])
+            connection.execute(insert(initial.tournament), [
+                {'id': tournament_id, 'date': date} for tournament_id, date in enumerate(TOURNAMENTS, start=1)
+            ])
+            connection.execute(insert(initial.point), [
+                {'tournament_id': tournament_id, 'player_id': player_id, 'points': float(player_id - 1), 'category': 'A'}
+                for tournament_id in range(1, len(TOURNAMENTS) + 1)
+                for player_id in range(1, len(PLAYERS) + 1)
+            ])
+        yield app
+        masnou.db.session.remove()
+        masnou.db.engine.dispose()
+
+
+def test_backfills_run_once_the_schema_is_up_to_date(legacy_app):
+    log = []
+    applied = masnou.run_migrations(log=log.append)
+
+    assert applied == [migration.version for migration in migrations.discover()]
+    assert migrations.pending(masnou.db.engine) == []
+    # Every schema change is applied before the first backfill
+    first_backfill = next(index for index, line in enumerate(log) if line.startswith('Backfilling'))
+    assert not any(line.startswith('Applying') for line in log[first_backfill:])
+    assert row_count(masnou.Standing) == len(PLAYERS)
+    assert row_count(masnou.PlayerTimeline) == len(PLAYERS) * len(TOURNAMENTS)
+    assert row_count(masnou.RatingHistory) == len(PLAYERS) * len(TOURNAMENTS)
+
+
+def test_an_interrupted_backfill_runs_again(legacy_app, monkeypatch):
+    refresh_standings = masnou.refresh_standings
+    calls = []
+
+    def fail_after_first_chunk(player_ids):
+        calls.append(player_ids)
+        if len(calls) > 1:
+            raise RuntimeError('interrupted')
+        refresh_standings(player_ids)
+
+    monkeypatch.setattr(masnou, 'refresh_standings', fail_after_first_chunk)
+    with pytest.raises(RuntimeError, match='interrupted'):
+        masnou.run_migrations(log=lambda message: None)
+    # The first chunk is committed, but the migration is not recorded
+    assert row_count(masnou.Standing) == 3
+    assert '0003' in {migration.version for migration in migrations.pending(masnou.db.engine)}
+
+    monkeypatch.setattr(masnou, 'refresh_standings', refresh_standings)
+    masnou.run_migrations(log=lambda message: None)
+
+    assert migrations.pending(masnou.db.engine) == []
+    assert row_count(masnou.Standing) == len(PLAYERS)
+    expected = {
+        player_id: total for player_id, total in
+        masnou.db.session.query(masnou.Point.player_id, func.sum(masnou.Point.points)).group_by(masnou.Point.player_id)
+    }
+    assert dict(masnou.db.session.query(masnou.Standing.player_id, masnou.Standing.total_points)) == expected
+
+
+@pytest.mark.sqlite_only
+@pytest.mark.parametrize('foreign_keys', [0, 1])
+def test_recreate_table_changes_a_column_on_sqlite(app, foreign_keys):
+    with app.app_context():
+        # A single pooled connection, so the one recreate_table() uses is the one checked below
+        engine = create_engine(app.config['SQLALCHEMY_DATABASE_URI'], pool_size=1, max_overflow=0)
+        context = migrations.MigrationContext(engine, masnou.db.session, masnou, log=lambda message: None)
+        context.execute('CREATE TABLE entry (id INTEGER PRIMARY KEY, '
+                        'player_id INTEGER REFERENCES player (id), note VARCHAR(10), score VARCHAR(10))')
+        context.execute("INSERT INTO player (id, first_name, last_name) VALUES (1, 'Anna', 'Puig')")
+        context.execute("INSERT INTO entry VALUES (1, 1, 'first', '1.5'), (2, NULL, 'second', '3')")
+
+        # Retypes score, makes it NOT NULL and drops note, which ALTER TABLE cannot do on SQLite
+        metadata = context.reflect('player')
+        entry = Table(
+            'entry', metadata,
+            Column('id', Integer, primary_key=True),
+            Column('player_id', Integer, ForeignKey('player.id')),
+            Column('score', Float, nullable=False),
+            Index('ix_entry_player', 'player_id'),
+        )
+        with engine.connect() as connection:
+            connection.exec_driver_sql(f'PRAGMA foreign_keys={foreign_keys}')
+            connection.commit()
+        context.recreate_table(entry, {'id': 'id', 'player_id': 'player_id', 'score': 'CAST(score AS REAL)'})
+        with engine.connect() as connection:
+            # The pooled connection keeps the setting it had
+            assert connection.exec_driver_sql('PRAGMA foreign_keys').scalar() == foreign_keys
+
+        columns = {column['name']: column for column in inspect(engine).get_columns('entry')}
+        assert list(columns) == ['id', 'player_id', 'score']
+        assert isinstance(columns['score']['type'], Float) and not columns['score']['nullable']
+        assert context.has_index('entry', 'ix_entry_player')
+        assert not context.has_table('_migrate_entry')
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql('SELECT id, player_id, score FROM entry ORDER BY id').all() == [
+                (1, 1, 1.5), (2, None, 3.0)
+            ]
+        engine.dispose()
@@ -0,0 +1,30 @@
+# tests/test_pairing.py
+import sys
+
+import pytest
+
+import pairing
+
+
+def test_pairs_everyone_without_rematches():
+    players = list(range(7))
+    scores = {0: 2, 1: 2, 2: 1, 3: 1, 4: 1, 5: 0, 6: 0}
+    opponents = {0: {1}, 1: {0}, 2: {3}, 3: {2}}
+    boards, bye = pairing.pair_round(players, scores, opponents, byes={6})
+    paired = [player for board in boards for player in board]
+    assert sorted(paired + [bye]) == players
+    assert bye == 5
+    assert all(black not in opponents.get(white, ()) for white, black in boards)
+
+
+def test_impossible_round_raises():
+    with pytest.raises(pairing.PairingError):
+        pairing.pair_round([1, 2], {}, {1: {2}, 2: {1}})
+
+
+def test_large_field_leaves_recursion_limit_alone():
+    limit = sys.getrecursionlimit()
+    players = list(range(limit + 200))
+    boards, bye = pairing.pair_round(players, {}, {})
+    assert len(boards) == len(players) // 2 and bye is None
+    assert sys.getrecursionlimit() == limit
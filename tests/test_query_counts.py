@@ -0,0 +1,58 @@
+# tests/test_query_counts.py
+"""
+Statement budgets of the busiest routes. A page whose statement count grows
+with the number of rows it shows (an N+1 lazy load) goes over its budget.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+import app as masnou
+
+# The logged-in user is loaded by every request (USER_CACHE_SECONDS=0), and counted
+BUDGETS = [
+    ('GET', '/', None, 2),
+    ('GET', '/view_results', None, 2),
+    ('POST', '/view_results', {'tournament': '1'}, 5),
+    ('GET', '/progression', None, 1),
+    ('POST', '/progression', {'players': ['1', '2', '3'], 'series': 'cumulative'}, 3),
+    ('POST', '/progression', {'players': ['1', '2', '3'], 'series': 'rank'}, 4),
+    ('GET', '/view_players', None, 3),
+    ('GET', '/view_players?q=puig', None, 4),
+    ('GET', '/api/v1/rankings', None, 2),
+    ('GET', '/api/v1/rankings?year=2024', None, 2),
+    ('GET', '/api/v1/tournaments', None, 2),
+    ('GET', '/api/v1/tournaments/1/results', None, 3),
+    ('GET', '/api/v1/progression?players=1,2,3', None, 2),
+    ('GET', '/api/v1/progression?players=1,2,3&rank=1', None, 3),
+    ('GET', '/api/v1/ratings', None, 2),
+    ('GET', '/api/v1/players?q=ser', None, 4),
+]
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.mark.parametrize('method, path, data, budget', BUDGETS, ids=[f'{m} {p}' for m, p, _, _ in BUDGETS])
+def test_statement_budget(client, seeded, method, path, data, budget):
+    with seeded.app_context():
+        engine = masnou.db.engine
+        if not masnou.uses_version_file():
+            # Off SQLite, every request reads the data version from its table once
+            budget += 1
+    with count_statements(engine) as statements:
+        response = client.open(path, method=method, data=data)
+    assert response.status_code == 200
+    assert len(statements) <= budget, '\n\n'.join(statements)
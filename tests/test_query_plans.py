@@ -0,0 +1,38 @@
+# tests/test_query_plans.py
+"""The hot queries of explain-queries must be served by indexes, never by full table scans."""
+import pytest
+
+import app as masnou
+
+pytestmark = pytest.mark.sqlite_only
+
+
+def hot_query_plans(app):
+    with app.app_context():
+        return [(name, masnou.query_plan(query)) for name, query in masnou.hot_queries()]
+
+
+def test_hot_queries_use_indexes(seeded):
+    full_scans = [
+        f'{name}: {detail}'
+        for name, plan in hot_query_plans(seeded)
+        for detail in plan if masnou.is_full_scan(detail)
+    ]
+    assert not full_scans, '\n'.join(full_scans)
+
+
+
+def test_rankings_are_read_in_index_order(seeded):
+    plans = dict(hot_query_plans(seeded))
+    for name in ('index', 'visualization (general, year)'):
+        assert not [detail for detail in plans[name] if 'TEMP B-TREE' in detail], plans[name]
+
+
+@pytest.mark.parametrize('detail, full_scan', [
+    ('SCAN point', True),
+    ('SCAN TABLE point', True),
+    ('SCAN standing USING INDEX ix_standing_total_points', False),
+    ('SEARCH point USING INDEX ix_point_tournament_category_points (tournament_id=?)', False),
+])
+def test_is_full_scan(detail, full_scan):
+    assert masnou.is_full_scan(detail) == full_scan
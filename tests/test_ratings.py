@@ -0,0 +1,50 @@
+# tests/test_ratings.py
+"""
+refresh_ratings replays only the tournaments from the changed date onwards,
+starting from the stored ratings before it; the result must be the full replay's.
+"""
+import pytest
+from conftest import TOURNAMENTS, derived_rows, rebuilt_rows
+
+import app as masnou
+
+
+def ratings_after(tournament_id):
+    return dict(masnou.db.session.query(masnou.RatingHistory.player_id, masnou.RatingHistory.rating)
+                .filter_by(tournament_id=tournament_id))
+
+
+@pytest.mark.parametrize('tournament_id', [1, 2])
+def test_result_added_to_a_past_tournament_replays_as_a_rebuild(client, seeded, tournament_id):
+    with seeded.app_context():
+        player = masnou.Player(first_name='Ivet', last_name='Roig')
+        masnou.db.session.add(player)
+        masnou.db.session.commit()
+        player_id = player.id
+        before = ratings_after(len(TOURNAMENTS))
+
+    response = client.post('/add_points', data={
+        'tournament': tournament_id, 'player': player_id, 'points': '4.0', 'category': 'A',
+    })
+    assert response.status_code == 302
+
+    with seeded.app_context():
+        # The new result moved the ratings of everyone met, up to the last tournament
+        assert ratings_after(len(TOURNAMENTS)) != before
+        assert masnou.db.session.get(masnou.RatingCheckpoint, 1).processed_through == TOURNAMENTS[-1]
+        replayed = derived_rows()
+        assert replayed == rebuilt_rows()
+        assert [row[1] for row in replayed['RatingHistory'] if row[0] == player_id] == [tournament_id]
+
+
+def test_replay_in_steps_matches_a_rebuild(seeded):
+    with seeded.app_context():
+        expected = derived_rows()
+        masnou.RatingHistory.query.delete()
+        masnou.RatingCheckpoint.query.delete()
+        steps = 0
+        while masnou.refresh_ratings(limit=1):
+            steps += 1
+        masnou.db.session.commit()
+        assert steps == len(TOURNAMENTS)
+        assert derived_rows() == expected